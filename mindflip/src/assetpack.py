@@ -0,0 +1,387 @@
+"""
+Asset pack for MindFlip: Memory Arcade
+
+Bundles the card faces, fonts and sounds into one file, so a cabinet opens
+a single file at launch instead of every asset on its own:
+
+    python -m mindflip.src.assetpack build
+    python -m mindflip.src.assetpack list
+
+A pack starts with an 8 byte magic string and the length of its index as a
+little-endian 32 bit number, followed by the index itself: JSON mapping
+every asset name, e.g. "cards/apple.png", to the [offset, size] of its
+bytes. Offsets count from the end of the index, where the asset data
+starts.
+
+At runtime the pack is memory-mapped once. Assets are handed out as file
+objects reading straight from the mapping, which pygame.image.load() and
+pygame.font.Font() accept, so decoding an asset makes no system calls of
+its own and only the pages actually read are paged in.
+"""
+
+import argparse
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+from mindflip.src.config import ASSET_PACK, CARDS_DIR, FONTS_DIR, SOUNDS_DIR
+
+# First bytes of every pack file
+PACK_MAGIC = b'MFPACK\x00\x01'
+# Magic string followed by the index length
+HEADER = struct.Struct('<8sI')
+
+# Pack folder of each asset directory
+PACK_SOURCES = {
+    'cards': CARDS_DIR,
+    'fonts': FONTS_DIR,
+    'sounds': SOUNDS_DIR
+}
+
+class PackedFile(io.RawIOBase):
+    """
+    Read-only file object over one asset's bytes in a mapped pack.
+
+    Attributes:
+        name (str): The asset name
+    """
+
+    def __init__(self, view, name):
+        """
+        Initialize a file positioned at the start of the asset.
+
+        Args:
+            view (memoryview): The asset's bytes
+            name (str): The asset name
+        """
+        super().__init__()
+        self._view = view
+        self._pos = 0
+        self.name = name
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        """
+        Copy bytes from the current position into a buffer.
+
+        Args:
+            buffer: A writable buffer
+
+        Returns:
+            int: Number of bytes copied, 0 at the end of the asset
+        """
+        count = max(0, min(len(buffer), len(self._view) - self._pos))
+        buffer[:count] = self._view[self._pos:self._pos + count]
+        self._pos += count
+        return count
+
+    def read(self, size=-1):
+        """
+        Read bytes from the current position.
+
+        Args:
+            size (int): Most bytes to read, or -1 for the rest of the asset
+
+        Returns:
+            bytes: The bytes read, empty at the end of the asset
+        """
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), self._pos + size)
+        data = self._view[self._pos:end].tobytes() if end > self._pos else b''
+        self._pos += len(data)
+        return data
+
+    def readall(self):
+        return self.read()
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """
+        Move the current position.
+
+        Args:
+            offset (int): The offset
+            whence (int): What the offset counts from: io.SEEK_SET,
+                io.SEEK_CUR or io.SEEK_END
+
+        Returns:
+            int: The new position
+
+        Raises:
+            ValueError: If the position would be negative
+        """
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"invalid whence ({whence})")
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset}")
+        self._pos = offset
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        """Close the file, letting go of the pack's mapping."""
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+class AssetPack:
+    """
+    A pack file, memory-mapped the first time an asset is asked for.
+
+    A missing pack is an empty one, so the game falls back to loose asset
+    files when none has been built.
+
+    Attributes:
+        path (str): The pack file
+    """
+
+    def __init__(self, path=ASSET_PACK):
+        """
+        Initialize a pack; nothing is read until it is first used.
+
+        Args:
+            path (str): The pack file
+        """
+        self.path = path
+        self._map = None
+        self._view = None
+        self._index = None
+        self._error = None
+
+    def index(self):
+        """
+        Get the pack index, mapping the pack on first use.
+
+        Returns:
+            dict: Asset name to its (offset, size) from the start of the data
+
+        Raises:
+            ValueError: If the file is not an asset pack or is damaged; the
+                error is raised again on later calls without rereading it
+        """
+        if self._error is not None:
+            raise ValueError(self._error)
+        if self._index is None:
+            try:
+                with open(self.path, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size < HEADER.size:
+                        raise ValueError(f"{self.path} is too short to be an asset pack")
+                    pack_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except FileNotFoundError:
+                self._index = {}
+                return self._index
+            except ValueError as error:
+                self._error = str(error)
+                raise
+
+            try:
+                index = self.read_index(pack_map)
+            except ValueError as error:
+                pack_map.close()
+                self._error = str(error)
+                raise
+            self._map = pack_map
+            self._view = memoryview(pack_map)
+            self._index = index
+        return self._index
+
+    def read_index(self, pack_map):
+        """
+        Read and check the index of a mapped pack.
+
+        Args:
+            pack_map (mmap.mmap): The mapped pack file
+
+        Returns:
+            dict: Asset name to its (offset, size) from the start of the file
+
+        Raises:
+            ValueError: If the header, the index or an entry is damaged
+        """
+        magic, index_size = HEADER.unpack_from(pack_map)
+        if magic != PACK_MAGIC:
+            raise ValueError(f"{self.path} is not a MindFlip asset pack")
+        data_start = HEADER.size + index_size
+        if data_start > len(pack_map):
+            raise ValueError(f"{self.path} is truncated in its index")
+        try:
+            entries = json.loads(pack_map[HEADER.size:data_start].decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as error:
+            raise ValueError(f"{self.path} has a damaged index: {error}") from None
+        if not isinstance(entries, dict):
+            raise ValueError(f"{self.path} has a damaged index: not a JSON object")
+
+        index = {}
+        for name, entry in entries.items():
+            if (not isinstance(entry, list) or len(entry) != 2
+                    or not all(type(number) is int and number >= 0 for number in entry)):
+                raise ValueError(f"{self.path} has a damaged index entry for {name}: {entry!r}")
+            offset, size = entry
+            if data_start + offset + size > len(pack_map):
+                raise ValueError(f"{self.path} is truncated at {name}")
+            index[name] = (data_start + offset, size)
+        return index
+
+    def __contains__(self, name):
+        return name in self.index()
+
+    def __len__(self):
+        return len(self.index())
+
+    def names(self, folder):
+        """
+        List the assets in a pack folder.
+
+        Args:
+            folder (str): The folder, e.g. "cards"
+
+        Returns:
+            list: Asset names in name order
+        """
+        prefix = folder.rstrip('/') + '/'
+        return sorted(name for name in self.index() if name.startswith(prefix))
+
+    def open(self, name):
+        """
+        Open an asset for reading straight from the mapped pack.
+
+        Args:
+            name (str): The asset name
+
+        Returns:
+            PackedFile: A file object over the asset's bytes
+
+        Raises:
+            KeyError: If the pack has no such asset
+        """
+        offset, size = self.index()[name]
+        return PackedFile(self._view[offset:offset + size], name)
+
+    def close(self):
+        """
+        Unmap the pack; it is mapped again if used afterwards.
+
+        Fonts keep their file objects open while they exist, so the mapping
+        stays alive until those are gone too.
+        """
+        if self._view is not None:
+            self._view.release()
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass
+        self._map = None
+        self._view = None
+        self._index = None
+        self._error = None
+
+def collect(sources=PACK_SOURCES):
+    """
+    List the files that go into a pack.
+
+    Args:
+        sources (dict): Pack folder to the directory its files come from
+
+    Returns:
+        list: (asset name, file path) tuples in name order
+    """
+    files = []
+    for folder, directory in sources.items():
+        for root, dirs, names in os.walk(directory):
+            dirs.sort()
+            for name in names:
+                path = os.path.join(root, name)
+                relative = os.path.relpath(path, directory).replace(os.sep, '/')
+                files.append((f"{folder}/{relative}", path))
+    return sorted(files)
+
+def build(output=ASSET_PACK, sources=PACK_SOURCES):
+    """
+    Build a pack from the asset directories.
+
+    The pack is written next to the output and moved into place when
+    complete, so a running game never sees half of one; if the build fails
+    the partial file is removed.
+
+    Args:
+        output (str): The pack file to write
+        sources (dict): Pack folder to the directory its files come from
+
+    Returns:
+        dict: Asset name to its size in bytes
+
+    Raises:
+        OSError: If an asset cannot be read or changes during the build
+    """
+    files = collect(sources)
+    index = {}
+    offset = 0
+    for name, path in files:
+        size = os.path.getsize(path)
+        index[name] = [offset, size]
+        offset += size
+    index_bytes = json.dumps(index, separators=(',', ':')).encode('utf-8')
+
+    temp_path = f"{output}.tmp"
+    try:
+        with open(temp_path, 'wb') as out:
+            out.write(HEADER.pack(PACK_MAGIC, len(index_bytes)))
+            out.write(index_bytes)
+            for name, path in files:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                if len(data) != index[name][1]:
+                    raise OSError(f"{path} changed while the pack was built")
+                out.write(data)
+        os.replace(temp_path, output)
+    except BaseException:
+        # A failed build leaves nothing behind
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return {name: size for name, (_, size) in index.items()}
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Build or inspect the MindFlip asset pack.")
+    parser.add_argument('command', choices=('build', 'list'), help="build the pack or list its assets")
+    parser.add_argument('--pack', default=ASSET_PACK, help=f"pack file (default: {ASSET_PACK})")
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        try:
+            sizes = build(args.pack)
+        except OSError as error:
+            print(f"Build failed: {error}", file=sys.stderr)
+            return 1
+        print(f"Packed {len(sizes)} assets ({sum(sizes.values())} bytes) into {args.pack}")
+        return 0
+
+    pack = AssetPack(args.pack)
+    try:
+        names = sorted(pack.index())
+    except ValueError as error:
+        print(f"Cannot read pack: {error}", file=sys.stderr)
+        return 1
+    for name in names:
+        print(f"{pack.index()[name][1]:>10}  {name}")
+    print(f"{len(names)} assets")
+    return 0
+
+# Shared pack the assets are loaded from
+asset_pack = AssetPack()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Card flip and match animations for MindFlip: Memory Arcade
+"""
+
+import math
+from collections import OrderedDict
+import pygame
+from mindflip.src.config import FPS, MATCH_ANIMATION_TIME
+from mindflip.src.card_sprites import CARD_HIDDEN, CARD_FLIPPED, CARD_MATCHED
+from mindflip.src.surfaces import prepare_surface
+
+# How much larger a matched card grows at the peak of its pulse
+MATCH_PULSE_SCALE = 0.12
+
+# Most strips of each kind kept; a marathon board shows far more faces than
+# this over a game, so the least recently played ones are dropped
+MAX_STRIPS = 128
+
+class CardAnimator:
+    """
+    Plays card flip and match animations from precomputed frame strips.
+
+    A flip squashes the old face horizontally down to nothing and widens the
+    new face back out; a match pulses the matched card. Every frame is scaled
+    once per card size in prepare(), or the first time a face animates, so
+    playing an animation only picks a surface out of a strip.
+
+    Attributes:
+        duration (float): Length of an animation in seconds
+        frame_count (int): Frames in each half of a flip
+    """
+
+    def __init__(self, card_sprites, duration=MATCH_ANIMATION_TIME / 1000, fps=FPS):
+        """
+        Initialize the animator with no strips built.
+
+        Args:
+            card_sprites (CardSpriteCache): Source of the card images
+            duration (float): Length of an animation in seconds
+            fps (int): Frame rate the strips are sampled for
+        """
+        self.card_sprites = card_sprites
+        self.duration = duration
+        self.frame_count = max(2, round(duration * fps / 2))
+        self._squash_strips = OrderedDict()
+        self._pulse_strips = OrderedDict()
+        self._card_size = None
+        self._states = {}
+        self._active = {}
+
+    def prepare(self, card_width, card_height, values, debug_mode):
+        """
+        Build the strips for every face the cards of a layout can show.
+
+        Strips for a previous card size are dropped.
+
+        Args:
+            card_width (int): Card width in pixels
+            card_height (int): Card height in pixels
+            values: The card values on the board
+            debug_mode (bool): Whether debug mode is on
+        """
+        card_size = (int(card_width), int(card_height))
+        if card_size != self._card_size:
+            self._squash_strips.clear()
+            self._pulse_strips.clear()
+            self._card_size = card_size
+
+        for value in values:
+            for state in (CARD_HIDDEN, CARD_FLIPPED, CARD_MATCHED):
+                sprite = self.card_sprites.get(card_size[0], card_size[1], state, value, debug_mode)
+                self.squash_strip(sprite)
+                if state == CARD_MATCHED:
+                    self.pulse_strip(sprite)
+
+    def squash_strip(self, sprite):
+        """
+        Get the frames of a card narrowing from full width to an edge.
+
+        Args:
+            sprite (pygame.Surface): The card image
+
+        Returns:
+            list: Surfaces, widest first
+        """
+        strip = self._cached(self._squash_strips, sprite)
+        if strip is None:
+            width, height = sprite.get_size()
+            alpha = bool(sprite.get_flags() & pygame.SRCALPHA)
+            strip = []
+            for i in range(self.frame_count):
+                # Follow a turning card's projected width
+                scale = math.cos(math.pi / 2 * i / self.frame_count)
+                frame_width = max(1, round(width * scale))
+                frame = pygame.transform.smoothscale(sprite, (frame_width, height))
+                strip.append(prepare_surface(frame, alpha=alpha))
+            self._store(self._squash_strips, sprite, strip)
+        return strip
+
+    def pulse_strip(self, sprite):
+        """
+        Get the frames of a card growing and shrinking back once.
+
+        Args:
+            sprite (pygame.Surface): The card image
+
+        Returns:
+            list: Surfaces covering the whole animation
+        """
+        strip = self._cached(self._pulse_strips, sprite)
+        if strip is None:
+            width, height = sprite.get_size()
+            alpha = bool(sprite.get_flags() & pygame.SRCALPHA)
+            strip = []
+            for i in range(self.frame_count * 2):
+                scale = 1 + MATCH_PULSE_SCALE * math.sin(math.pi * i / (self.frame_count * 2))
+                frame = pygame.transform.smoothscale(sprite, (round(width * scale), round(height * scale)))
+                strip.append(prepare_surface(frame, alpha=alpha))
+            self._store(self._pulse_strips, sprite, strip)
+        return strip
+
+    @staticmethod
+    def _cached(strips, sprite):
+        """Look a strip up, marking it as recently used."""
+        strip = strips.get(sprite)
+        if strip is not None:
+            strips.move_to_end(sprite)
+        return strip
+
+    @staticmethod
+    def _store(strips, sprite, strip):
+        """Keep a strip, dropping the least recently used beyond MAX_STRIPS."""
+        strips[sprite] = strip
+        if len(strips) > MAX_STRIPS:
+            strips.popitem(last=False)
+
+    def update(self, key, state, now):
+        """
+        Record a card's state, starting an animation when it changed.
+
+        Args:
+            key: Hashable identifier of the card, such as its grid position
+            state (int): CARD_HIDDEN, CARD_FLIPPED or CARD_MATCHED
+            now (float): The current time in seconds
+        """
+        previous = self._states.get(key)
+        self._states[key] = state
+        if previous is not None and previous != state:
+            self._active[key] = (now, previous, state)
+
+    def frame(self, key, value, debug_mode, now):
+        """
+        Get the current frame of a card's animation.
+
+        Args:
+            key: Identifier the card's state was recorded under
+            value (int): The card value
+            debug_mode (bool): Whether debug mode is on
+            now (float): The current time in seconds
+
+        Returns:
+            pygame.Surface: The frame to show centred on the card, or None
+            when the card is not animating
+        """
+        animation = self._active.get(key)
+        if animation is None:
+            return None
+
+        start_time, previous, state = animation
+        progress = (now - start_time) / self.duration
+        if progress >= 1.0:
+            del self._active[key]
+            return None
+
+        width, height = self._card_size
+        target = self.card_sprites.get(width, height, state, value, debug_mode)
+
+        # A card that was already face up pulses when it is matched
+        if previous == CARD_FLIPPED and state == CARD_MATCHED:
+            strip = self.pulse_strip(target)
+            return strip[int(progress * len(strip))]
+
+        # Otherwise it turns over: the old face narrows, the new one widens
+        if progress < 0.5:
+            source = self.card_sprites.get(width, height, previous, value, debug_mode)
+            return self.squash_strip(source)[int(progress * 2 * self.frame_count)]
+        strip = self.squash_strip(target)
+        return strip[self.frame_count - 1 - int((progress - 0.5) * 2 * self.frame_count)]
+
+    def is_animating(self):
+        """Check whether any card animation is still playing."""
+        return bool(self._active)
+
+    def reset(self):
+        """Forget all card states and animations, e.g. when a new grid is dealt."""
+        self._states.clear()
+        self._active.clear()
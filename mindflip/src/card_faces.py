@@ -0,0 +1,330 @@
+"""
+Card face art for MindFlip: Memory Arcade
+"""
+
+import os
+from collections import OrderedDict
+import pygame
+from mindflip.src.config import CARDS_DIR, CARD_FACE_BUDGET
+from mindflip.src.assetpack import asset_pack
+from mindflip.src.surfaces import prepare_surface
+
+# Image files card faces are loaded from
+FACE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tga', '.webp')
+
+# Face slots per atlas page, across and down
+ATLAS_COLUMNS = 8
+ATLAS_ROWS = 4
+
+class FaceAtlas:
+    """
+    Card faces scaled to one size and packed into pages of equal slots.
+
+    Pages are added as faces come in. Once the owner stops adding pages,
+    the least recently used face gives up its slot to the next one.
+
+    Attributes:
+        slot_width (int): Width of a face slot
+        slot_height (int): Height of a face slot
+        pages (list): The page surfaces
+    """
+
+    def __init__(self, slot_width, slot_height):
+        """
+        Initialize an atlas with no pages.
+
+        Args:
+            slot_width (int): Width of a face slot
+            slot_height (int): Height of a face slot
+        """
+        self.slot_width = slot_width
+        self.slot_height = slot_height
+        self.pages = []
+        self._free = []
+        self._faces = OrderedDict()
+
+    @property
+    def page_bytes(self):
+        """Memory one page takes, in bytes."""
+        return self.slot_width * ATLAS_COLUMNS * self.slot_height * ATLAS_ROWS * 4
+
+    @property
+    def nbytes(self):
+        """Memory all pages take, in bytes."""
+        return self.page_bytes * len(self.pages)
+
+    def __len__(self):
+        return len(self._faces)
+
+    def has_free_slot(self):
+        """Check whether a face can be stored without a new page or eviction."""
+        return bool(self._free)
+
+    def add_page(self):
+        """Add an empty page, freeing its slots for faces."""
+        page = pygame.Surface((self.slot_width * ATLAS_COLUMNS, self.slot_height * ATLAS_ROWS), pygame.SRCALPHA)
+        page = prepare_surface(page, alpha=True)
+        self.pages.append(page)
+        for row in range(ATLAS_ROWS):
+            for col in range(ATLAS_COLUMNS):
+                slot = pygame.Rect(col * self.slot_width, row * self.slot_height, self.slot_width, self.slot_height)
+                self._free.append((page, slot))
+
+    def evict_oldest(self):
+        """Free the slot of the least recently used face."""
+        _, (page, slot, _) = self._faces.popitem(last=False)
+        self._free.append((page, slot))
+
+    def lookup(self, value):
+        """
+        Get a stored face, marking it as recently used.
+
+        Args:
+            value (int): The card value
+
+        Returns:
+            pygame.Surface: The face (a subsurface of its page), or None
+        """
+        entry = self._faces.get(value)
+        if entry is None:
+            return None
+        self._faces.move_to_end(value)
+        return entry[2]
+
+    def store(self, value, image):
+        """
+        Copy a face into a free slot; has_free_slot() must be true.
+
+        Args:
+            value (int): The card value
+            image (pygame.Surface): The face, at most the slot size
+
+        Returns:
+            pygame.Surface: The stored face (a subsurface of its page)
+        """
+        page, slot = self._free.pop()
+        area = image.get_rect(topleft=slot.topleft)
+        page.fill((0, 0, 0, 0), slot)
+        page.blit(image, area, special_flags=pygame.BLEND_RGBA_MAX)
+        face = page.subsurface(area)
+        self._faces[value] = (page, slot, face)
+        return face
+
+class CardFaceCache:
+    """
+    Loads card face art on demand and keeps it in per-size atlases.
+
+    The face for card value n is the nth image file in CARDS_DIR, in name
+    order; values beyond the last file have no art and are drawn as
+    numbers. When the asset pack has card faces they are used instead of
+    the directory, decoded straight from the mapped pack; a damaged pack is
+    ignored. Only the listing is read up front. A face is decoded the first
+    time it is shown at a card size, scaled once into that size's atlas,
+    and the decoded original is dropped. The atlases together stay
+    within a memory budget: atlases of card sizes no longer in use are
+    dropped first, then the least recently used faces of the current size.
+
+    Attributes:
+        directory (str): Where the face images are
+        pack (AssetPack): The asset pack checked before the directory
+        budget (int): Most bytes the atlases may take together
+        hits (int): Number of faces served from an atlas
+        loads (int): Number of faces decoded from their files
+        evictions (int): Number of faces dropped to stay within the budget
+    """
+
+    def __init__(self, directory=CARDS_DIR, budget=CARD_FACE_BUDGET, pack=None):
+        """
+        Initialize an empty cache; nothing is read until a face is asked for.
+
+        Args:
+            directory (str): Where the face images are
+            budget (int): Most bytes the atlases may take together
+            pack (AssetPack): The asset pack checked before the directory,
+                or None to only use the directory
+        """
+        self.directory = directory
+        self.budget = budget
+        self.pack = pack
+        self._paths = None
+        self._packed = False
+        self._atlases = OrderedDict()
+        self._broken = set()
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def paths(self):
+        """
+        Get the face images, listing the pack or directory on first use.
+
+        Returns:
+            list: Asset names in the pack or file paths, in name order
+        """
+        if self._paths is None and self.pack is not None:
+            try:
+                names = [name for name in self.pack.names('cards') if name.lower().endswith(FACE_EXTENSIONS)]
+            except ValueError:
+                # Use the loose files rather than fail over a damaged pack
+                names = []
+            if names:
+                self._paths = names
+                self._packed = True
+        if self._paths is None:
+            try:
+                names = sorted(name for name in os.listdir(self.directory)
+                               if name.lower().endswith(FACE_EXTENSIONS))
+            except OSError:
+                names = []
+            self._paths = [os.path.join(self.directory, name) for name in names]
+        return self._paths
+
+    def has_face(self, value):
+        """
+        Check whether a card value has face art.
+
+        Args:
+            value (int): The card value
+
+        Returns:
+            bool: True if there is an image file for the value
+        """
+        return 1 <= value <= len(self.paths()) and value not in self._broken
+
+    def get(self, value, width, height):
+        """
+        Get a card's face scaled to fit a box.
+
+        The surface belongs to the atlas and may be reused for another face
+        later, so it should be drawn onto the card right away, not kept.
+
+        Args:
+            value (int): The card value
+            width (int): Width of the box
+            height (int): Height of the box
+
+        Returns:
+            pygame.Surface: The face, or None if the value has no usable art
+        """
+        if not self.has_face(value):
+            return None
+
+        size = (max(1, int(width)), max(1, int(height)))
+        atlas = self._atlases.get(size)
+        if atlas is None:
+            atlas = self._atlases[size] = FaceAtlas(*size)
+        self._atlases.move_to_end(size)
+
+        face = atlas.lookup(value)
+        if face is not None:
+            self.hits += 1
+            return face
+
+        try:
+            image = self.load(value)
+        except (pygame.error, OSError):
+            # Draw the card as a number from now on
+            self._broken.add(value)
+            return None
+        self.loads += 1
+
+        self.make_room(atlas)
+        return atlas.store(value, fit_image(image, size))
+
+    def load(self, value):
+        """
+        Decode the face image of a card value.
+
+        Args:
+            value (int): The card value
+
+        Returns:
+            pygame.Surface: The image at its original size
+
+        Raises:
+            pygame.error: If the file cannot be decoded
+            OSError: If the file cannot be read
+        """
+        path = self.paths()[value - 1]
+        if self._packed:
+            with self.pack.open(path) as f:
+                return pygame.image.load(f, os.path.basename(path))
+        return pygame.image.load(path)
+
+    def make_room(self, atlas):
+        """
+        Make sure an atlas has a free slot, staying within the budget.
+
+        Args:
+            atlas (FaceAtlas): The atlas a face is about to be stored in
+        """
+        if atlas.has_free_slot():
+            return
+
+        # Atlases of other card sizes go first, least recently used first
+        while self.nbytes + atlas.page_bytes > self.budget:
+            stale = next((size for size, other in self._atlases.items() if other is not atlas), None)
+            if stale is None:
+                break
+            self.evictions += len(self._atlases.pop(stale))
+
+        # An atlas always gets one page, however small the budget
+        if self.nbytes + atlas.page_bytes <= self.budget or not atlas.pages:
+            atlas.add_page()
+        else:
+            atlas.evict_oldest()
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every atlas and forget the face files, e.g. before pygame is shut down."""
+        self._atlases.clear()
+        self._broken.clear()
+        self._paths = None
+        self._packed = False
+
+    @property
+    def nbytes(self):
+        """Memory all atlases take, in bytes."""
+        return sum(atlas.nbytes for atlas in self._atlases.values())
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Face files, faces held, memory used, hits, loads and evictions
+        """
+        return {
+            'files': len(self.paths()),
+            'faces': sum(len(atlas) for atlas in self._atlases.values()),
+            'bytes': self.nbytes,
+            'hits': self.hits,
+            'loads': self.loads,
+            'evictions': self.evictions
+        }
+
+def fit_image(image, size):
+    """
+    Scale an image to fit inside a box, keeping its aspect ratio.
+
+    Args:
+        image (pygame.Surface): The image
+        size: (width, height) of the box
+
+    Returns:
+        pygame.Surface: The scaled image with per-pixel alpha
+    """
+    width, height = image.get_size()
+    scale = min(size[0] / width, size[1] / height)
+    target = (max(1, min(size[0], round(width * scale))), max(1, min(size[1], round(height * scale))))
+    image = prepare_surface(image, alpha=True)
+    if image.get_bitsize() < 24:
+        # smoothscale needs 24 or 32 bit pixels, and without a display mode
+        # prepare_surface() leaves e.g. palette images as they are
+        converted = pygame.Surface(image.get_size(), pygame.SRCALPHA, 32)
+        converted.blit(image, (0, 0))
+        image = converted
+    return pygame.transform.smoothscale(image, target)
+
+# Shared face cache used by the card sprites
+card_faces = CardFaceCache(pack=asset_pack)
@@ -0,0 +1,183 @@
+"""
+Pre-rendered card sprites for MindFlip: Memory Arcade
+"""
+
+import pygame
+from collections import OrderedDict
+from mindflip.src.config import (
+    CARD_WIDTH, CARD_BACK_COLOR, CARD_FRONT_COLOR, CARD_MATCHED_COLOR,
+    CARD_SPRITE_CACHE_SIZE
+)
+from mindflip.src.surfaces import prepare_surface
+
+# Card visual states
+CARD_HIDDEN = 0
+CARD_FLIPPED = 1
+CARD_MATCHED = 2
+
+def card_state(card):
+    """
+    Get the visual state of a card.
+    
+    Args:
+        card: The card to inspect
+        
+    Returns:
+        int: One of CARD_HIDDEN, CARD_FLIPPED or CARD_MATCHED
+    """
+    if card.matched:
+        return CARD_MATCHED
+    if card.flipped:
+        return CARD_FLIPPED
+    return CARD_HIDDEN
+
+class CardSpriteCache:
+    """
+    Renders each card variant once and hands out the finished surface.
+    
+    Sprites are keyed by (card_width, card_height, state, value, debug_mode).
+    Only one card size is on screen at a time, so asking for a different size
+    evicts every sprite rendered for the previous layout. Large boards can
+    show more faces than the cache holds; the least recently used sprite is
+    then evicted.
+    
+    Attributes:
+        capacity (int): Maximum number of cached sprites
+        hits (int): Number of sprites served from the cache
+        misses (int): Number of sprites that had to be rendered
+        evictions (int): Number of sprites dropped to stay within capacity
+    """
+    
+    def __init__(self, fonts, faces=None, capacity=CARD_SPRITE_CACHE_SIZE):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            fonts: The FontRegistry used to render card values
+            faces: The CardFaceCache supplying face art, or None to draw
+                every card as a number
+            capacity (int): Maximum number of cached sprites
+        """
+        self.fonts = fonts
+        self.faces = faces
+        self.capacity = capacity
+        self._sprites = OrderedDict()
+        self._card_size = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, card_width, card_height, state, value, debug_mode):
+        """
+        Get the sprite for a card, rendering it on first use.
+        
+        Args:
+            card_width (int): Card width in pixels
+            card_height (int): Card height in pixels
+            state (int): CARD_HIDDEN, CARD_FLIPPED or CARD_MATCHED
+            value (int): The card value
+            debug_mode (bool): Whether debug mode is on
+            
+        Returns:
+            pygame.Surface: The rendered card
+        """
+        card_size = (int(card_width), int(card_height))
+        if card_size != self._card_size:
+            self.clear()
+            self._card_size = card_size
+        
+        # Face-down cards outside debug mode all look the same
+        if state == CARD_HIDDEN and not debug_mode:
+            value = None
+        
+        key = (card_size[0], card_size[1], state, value, debug_mode)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            self.misses += 1
+            sprite = self.render(card_size[0], card_size[1], state, value, debug_mode)
+            self._sprites[key] = sprite
+            if len(self._sprites) > self.capacity:
+                self._sprites.popitem(last=False)
+                self.evictions += 1
+        else:
+            self.hits += 1
+            self._sprites.move_to_end(key)
+        return sprite
+    
+    def render(self, card_width, card_height, state, value, debug_mode):
+        """
+        Render a card variant from primitives.
+        
+        Args:
+            card_width (int): Card width in pixels
+            card_height (int): Card height in pixels
+            state (int): CARD_HIDDEN, CARD_FLIPPED or CARD_MATCHED
+            value (int): The card value
+            debug_mode (bool): Whether debug mode is on
+            
+        Returns:
+            pygame.Surface: The rendered card
+        """
+        # Scale font size based on card size
+        font_scale = min(card_width / CARD_WIDTH, 1.0)
+        card_font = self.fonts.get('Arial', int(32 * font_scale), bold=True)
+        debug_font = self.fonts.get('Arial', int(16 * font_scale), bold=True)
+        
+        if state == CARD_HIDDEN and debug_mode:
+            # Semi-transparent in debug mode
+            sprite = pygame.Surface((card_width, card_height), pygame.SRCALPHA)
+            sprite.fill((CARD_BACK_COLOR[0], CARD_BACK_COLOR[1], CARD_BACK_COLOR[2], 180))
+        else:
+            sprite = pygame.Surface((card_width, card_height))
+            if state == CARD_MATCHED:
+                sprite.fill(CARD_MATCHED_COLOR)
+            elif state == CARD_FLIPPED:
+                sprite.fill(CARD_FRONT_COLOR)
+            else:
+                sprite.fill(CARD_BACK_COLOR)
+        
+        # Face-up cards show their face art inside a border of the card
+        # color, or their value when there is no art for it
+        face = None
+        if state != CARD_HIDDEN and self.faces is not None:
+            border = max(2, int(8 * font_scale))
+            face = self.faces.get(value, card_width - 2 * border, card_height - 2 * border)
+        if face is not None:
+            sprite.blit(face, face.get_rect(center=(card_width//2, card_height//2)))
+        
+        # Draw card value for face-up cards, and for face-down ones in debug mode
+        elif state != CARD_HIDDEN or debug_mode:
+            value_text = card_font.render(str(value), True, (0, 0, 0))
+            text_rect = value_text.get_rect(center=(card_width//2, card_height//2))
+            sprite.blit(value_text, text_rect)
+        
+        if state == CARD_HIDDEN:
+            if debug_mode:
+                # Small number in the corner for face-down cards
+                small_value = debug_font.render(str(value), True, (255, 255, 255))
+                sprite.blit(small_value, (5, 5))
+            else:
+                # Card back design
+                inner_margin = int(10 * font_scale)
+                pygame.draw.rect(sprite, (100, 100, 150),
+                                 (inner_margin, inner_margin,
+                                  card_width - 2*inner_margin, card_height - 2*inner_margin))
+                
+                # Draw a simple pattern on the back
+                line_spacing = int(30 * font_scale)
+                line_margin = int(20 * font_scale)
+                for i in range(3):
+                    pygame.draw.line(sprite, (50, 50, 100),
+                                     (line_margin, line_margin + i*line_spacing),
+                                     (card_width - line_margin, line_margin + i*line_spacing),
+                                     max(1, int(3 * font_scale)))
+        
+        return prepare_surface(sprite, alpha=state == CARD_HIDDEN and debug_mode)
+    
+    def clear(self):
+        """Evict every cached sprite."""
+        self._sprites.clear()
+        self._card_size = None
+    
+    def __len__(self):
+        return len(self._sprites)
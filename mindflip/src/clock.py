@@ -0,0 +1,40 @@
+"""
+Time source for MindFlip: Memory Arcade
+"""
+
+import time
+
+class GameClock:
+    """
+    The source of the current time for game timers and animations.
+
+    Everything that measures time asks this clock rather than calling
+    time.time() itself, so the headless runner can swap in a clock that
+    advances by exactly one frame per frame and make runs reproducible.
+    """
+
+    def __init__(self):
+        """Initialize the clock on the wall clock."""
+        self.source = time.time
+
+    def now(self):
+        """
+        Get the current time.
+
+        Returns:
+            float: The current time in seconds
+        """
+        return self.source()
+
+    def set_source(self, source=None):
+        """
+        Change where the time comes from.
+
+        Args:
+            source: Callable returning the time in seconds, or None for the
+                wall clock
+        """
+        self.source = source or time.time
+
+# Shared clock used by all game code
+clock = GameClock()
@@ -12,6 +12,7 @@ CARDS_DIR = os.path.join(ASSETS_DIR, "cards")
 FONTS_DIR = os.path.join(ASSETS_DIR, "fonts")
 SOUNDS_DIR = os.path.join(BASE_DIR, "sounds")
 DATA_DIR = os.path.join(BASE_DIR, "data")
+ASSET_PACK = os.path.join(BASE_DIR, "assets.pack")  # Built by python -m mindflip.src.assetpack build
 
 # Game settings
 WINDOW_WIDTH = 800
@@ -43,7 +44,9 @@ ICON_HOVER_COLOR = (255, 255, 255)  # Icon hover color
 # Game timing (in milliseconds)
 FLIP_DELAY = 1000  # Time cards stay flipped when not matched
 LEVEL_TRANSITION_DELAY = 2000  # Time between levels (2 seconds)
-MATCH_ANIMATION_TIME = 500  # Time for match animation
+MATCH_ANIMATION_TIME = 500  # Time for card flip and match animations
+TICK_RATE = 60  # Game logic updates per second, independent of the frame rate
+MAX_TICKS_PER_FRAME = 10  # Most logic updates run to catch up after a slow frame
 
 # High score file
 HIGH_SCORE_FILE = os.path.join(DATA_DIR, "high_score.txt")
@@ -64,6 +67,12 @@ TIME_BONUS_FACTOR = 0.5  # Bonus points factor for quick matches
 # Debug mode
 DEBUG_MODE = False  # Set to False by default, can be toggled in game
 
+# Marathon mode: the board grows without limit and scrolls in a viewport
+MARATHON_MODE = False  # Toggled with M on the splash screen
+MARATHON_ZOOM_LEVELS = (0.4, 0.6, 0.8, 1.0)  # Card sizes relative to CARD_WIDTH x CARD_HEIGHT
+MARATHON_DEFAULT_ZOOM = 0.6
+SCROLL_STEP = 40  # Pixels scrolled per mouse wheel notch
+
 # Text size settings
 TEXT_SIZE_SMALL = 0.8
 TEXT_SIZE_MEDIUM = 1.0  # Default
@@ -77,13 +86,34 @@ COMBO_TIMEOUT = 5.0           # Seconds before combo resets
 # Animation settings
 ANIMATE_BACKGROUND = True
 BACKGROUND_ANIMATION_SPEED = 0.5  # Speed of background animation
+STAR_COUNT = 100  # Stars in the animated background (thousands are fine)
+SCORE_ROLL_TIME = 0.6  # Seconds the score counter takes to roll up to a new score
+
+# Rendering settings
+# Push only changed screen regions to the display instead of flipping the
+# whole frame. Pays off when the animated background is turned off.
+DIRTY_RECT_RENDERING = False
+TEXT_CACHE_SIZE = 256  # Rendered text surfaces kept by the LRU text cache
+CARD_SPRITE_CACHE_SIZE = 512  # Rendered card sprites kept by the LRU card sprite cache
+CARD_FACE_BUDGET = 32 * 1024 * 1024  # Bytes the card face art atlases may take together
+TOAST_QUEUE_SIZE = 3  # Toast messages shown stacked at the same time
+
+# Particle effects
+PARTICLE_CAPACITY = 50000  # Particle slots, preallocated once
+MATCH_PARTICLES = 40  # Particles per matched card, multiplied by the combo count
+PARTICLE_LIFETIME = 1.2  # Longest particle life in seconds
+STRESS_EMIT_STEP = 20  # Per-frame emission increase in the particle stress test
+
+# Frame profiler (shown in debug mode)
+PROFILER_WINDOW = 240  # Recent frames the timing percentiles cover
+PROFILER_REFRESH = 15  # Frames between redraws of the profiler overlay
 
 # Game rules text
 GAME_RULES = [
     "HOW TO PLAY:",
     "1. Flip cards to find matching pairs",
     "2. Use arrow keys to navigate",
-    "3. Press Enter to flip a card",
+    "3. Press Enter or click to flip a card",
     "4. Match all pairs to complete a level",
     "5. Each level adds more cards",
     "6. Earn an extra life every 2 levels",
@@ -0,0 +1,215 @@
+"""
+Replay exporter for MindFlip: Memory Arcade
+
+Re-plays a recorded session off-screen and saves its frames, to cut
+highlight clips from:
+
+    python -m mindflip.src.export --script session.txt --start 600 --end 1200 --out clip
+
+The session is an input script in the headless runner's format (see
+mindflip.src.headless) and is played with the same seed and frame rate it
+was recorded with. Frames are written as a numbered PNG sequence, or with
+--encoder streamed as raw RGB frames into a local encoder's standard input:
+
+    python -m mindflip.src.export --script session.txt --end 3600 --encoder \\
+        "ffmpeg -f rawvideo -pix_fmt rgb24 -s 800x600 -r 60 -i - clip.mp4"
+
+The frame range is split into one contiguous chunk per worker process.
+Every game frame depends on the ones before it, so each worker replays the
+session from the start, rendering but not saving the frames ahead of its
+chunk; saving frames is what costs the most and is what runs in parallel.
+"""
+
+import argparse
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pygame
+from mindflip.src.config import FPS
+from mindflip.src.headless import HeadlessRunner, clear_shared_caches, default_script
+
+def split_range(start, end, chunks):
+    """
+    Split a frame range into contiguous chunks of nearly equal length.
+
+    Args:
+        start (int): First frame
+        end (int): Frame after the last one
+        chunks (int): Number of chunks wanted
+
+    Returns:
+        list: (start, end) tuples in order, none of them empty
+    """
+    total = max(0, end - start)
+    chunks = max(1, min(chunks, total))
+    bounds = [start + total * i // chunks for i in range(chunks + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(chunks) if bounds[i] < bounds[i + 1]]
+
+def frame_path(output_dir, frame, raw=False):
+    """
+    Get the file a frame, or a raw chunk starting at that frame, is written to.
+
+    Args:
+        output_dir (str): Output directory
+        frame (int): Frame number
+        raw (bool): Whether the file holds a raw chunk
+
+    Returns:
+        str: The file path
+    """
+    return os.path.join(output_dir, f"{'chunk' if raw else 'frame'}_{frame:06d}.{'rgb' if raw else 'png'}")
+
+def export_chunk(script, seed, fps, start, end, output_dir, raw=False):
+    """
+    Replay a session and save the frames of one chunk.
+
+    Runs in a worker process, which gets its own off-screen display. A
+    worker may run several chunks one after another, so each one starts
+    from empty shared caches.
+
+    Args:
+        script (list): Input script lines
+        seed: Random seed the session was recorded with
+        fps (int): Frame rate the session was recorded at
+        start (int): First frame to save
+        end (int): Frame after the last one to save
+        output_dir (str): Directory the frames are written to
+        raw (bool): Write the chunk as one file of raw RGB frames instead
+            of a PNG per frame
+
+    Returns:
+        int: Number of frames saved, fewer than asked if the session quit
+    """
+    clear_shared_caches()
+    runner = HeadlessRunner(script, seed, fps)
+    saved = 0
+    try:
+        # Catch up on the frames before the chunk without saving them
+        while runner.frame < start:
+            if not runner.step():
+                return 0
+
+        out = open(frame_path(output_dir, start, raw=True), 'wb') if raw else None
+        try:
+            while runner.frame < end:
+                frame = runner.frame
+                if not runner.step():
+                    break
+                if raw:
+                    out.write(pygame.image.tobytes(runner.screen, 'RGB'))
+                else:
+                    pygame.image.save(runner.screen, frame_path(output_dir, frame))
+                saved += 1
+        finally:
+            if out:
+                out.close()
+    finally:
+        runner.close()
+    return saved
+
+def export(script, start, end, output_dir, seed=0, fps=FPS, workers=None, encoder=None):
+    """
+    Export a range of a recorded session's frames using a pool of processes.
+
+    Args:
+        script (list): Input script lines
+        start (int): First frame to export
+        end (int): Frame after the last one to export
+        output_dir (str): Directory for the PNG sequence; ignored when
+            streaming to an encoder
+        seed: Random seed the session was recorded with
+        fps (int): Frame rate the session was recorded at
+        workers (int): Number of worker processes, by default one per CPU
+        encoder (str): Command line of an encoder reading raw RGB frames
+            from its standard input, or None to write PNGs
+
+    Returns:
+        int: Number of frames exported
+
+    Raises:
+        RuntimeError: If the encoder fails
+    """
+    chunks = split_range(start, end, workers or os.cpu_count() or 1)
+    raw = encoder is not None
+    if raw:
+        # Raw chunks are only kept until the encoder has read them
+        temp_dir = tempfile.TemporaryDirectory(prefix="mindflip-export-")
+        output_dir = temp_dir.name
+    else:
+        os.makedirs(output_dir, exist_ok=True)
+
+    try:
+        with ProcessPoolExecutor(max_workers=len(chunks) or 1) as pool:
+            futures = [pool.submit(export_chunk, script, seed, fps, chunk_start, chunk_end, output_dir, raw)
+                       for chunk_start, chunk_end in chunks]
+            saved = [future.result() for future in futures]
+
+        # A session that quit early leaves the chunks after it short or empty
+        written = []
+        for (chunk_start, chunk_end), count in zip(chunks, saved):
+            if count:
+                written.append((chunk_start, count))
+            if count < chunk_end - chunk_start:
+                break
+
+        if raw:
+            # Feed the chunks to the encoder in order
+            process = subprocess.Popen(shlex.split(encoder), stdin=subprocess.PIPE)
+            try:
+                for chunk_start, count in written:
+                    with open(frame_path(output_dir, chunk_start, raw=True), 'rb') as f:
+                        shutil.copyfileobj(f, process.stdin)
+                process.stdin.close()
+            except BrokenPipeError:
+                # The encoder stopped reading; its exit status says why
+                pass
+            if process.wait() != 0:
+                raise RuntimeError(f"encoder exited with status {process.returncode}")
+    finally:
+        if raw:
+            temp_dir.cleanup()
+
+    return sum(count for _, count in written)
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Export the frames of a recorded MindFlip session.")
+    parser.add_argument('--script', help="recorded input script (default: the headless runner's built-in session)")
+    parser.add_argument('--start', type=int, default=0, help="first frame to export (default: 0)")
+    parser.add_argument('--end', type=int, required=True, help="frame after the last one to export")
+    parser.add_argument('--out', default='frames', help="directory for the PNG sequence (default: frames)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed of the session (default: 0)")
+    parser.add_argument('--fps', type=int, default=FPS, help=f"frame rate of the session (default: {FPS})")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--encoder', help="pipe raw RGB frames into this command instead of writing PNGs")
+    args = parser.parse_args(argv)
+
+    if not 0 <= args.start < args.end:
+        parser.error("--start must be at least 0 and less than --end")
+    if args.script:
+        with open(args.script) as f:
+            script = f.read().splitlines()
+    else:
+        script = default_script()
+
+    started = time.perf_counter()
+    try:
+        frames = export(script, args.start, args.end, args.out, args.seed, args.fps,
+                        args.workers, args.encoder)
+    except (ValueError, RuntimeError) as error:
+        print(f"Export failed: {error}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+
+    destination = "the encoder" if args.encoder else args.out
+    print(f"Exported {frames} frames to {destination} in {elapsed:.2f}s "
+          f"({frames / elapsed:.0f} frames/s, {frames / args.fps / elapsed:.1f}x real time)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Font registry for MindFlip: Memory Arcade
+"""
+
+import os
+import pygame
+from mindflip.src.assetpack import asset_pack
+from mindflip.src.profiler import profiler
+
+# Font files that can stand in for system fonts
+FONT_EXTENSIONS = ('.ttf', '.otf')
+
+class FontRegistry:
+    """
+    Shared cache of pygame fonts keyed by (face, size, bold).
+
+    Building a SysFont involves a system font lookup, so every font is
+    constructed once and then reused by all drawing code. A font file in the
+    asset pack named after the face, e.g. "fonts/Arial.ttf", is used instead
+    of the system font; "fonts/Arial-Bold.ttf" is used for the bold one if
+    the pack has it. A damaged pack, or a packed font pygame cannot read,
+    falls back to the system font.
+
+    Attributes:
+        pack (AssetPack): The asset pack checked for font files
+        hits (int): Number of lookups served from the cache
+        misses (int): Number of lookups that had to construct a font
+    """
+
+    def __init__(self, pack=None):
+        """
+        Initialize an empty registry.
+
+        Args:
+            pack (AssetPack): The asset pack checked for font files, or None
+                to only use system fonts
+        """
+        self.pack = pack
+        self._fonts = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, face, size, bold=False):
+        """
+        Get a font, constructing it only on the first request.
+
+        Args:
+            face (str): System font name
+            size (int): Point size
+            bold (bool): Whether the font is bold
+
+        Returns:
+            pygame.font.Font: The cached font
+        """
+        key = (face, max(1, int(size)), bold)
+        font = self._fonts.get(key)
+        if font is None:
+            self.misses += 1
+            with profiler.phase('font creation'):
+                if not pygame.font.get_init():
+                    pygame.font.init()
+                font = None
+                packed = self.packed_font(face, bold)
+                if packed is not None:
+                    # The font reads its glyphs from the mapped pack as needed
+                    name, synthetic_bold = packed
+                    try:
+                        font = pygame.font.Font(self.pack.open(name), key[1])
+                        font.bold = synthetic_bold
+                    except (pygame.error, OSError):
+                        font = None
+                if font is None:
+                    font = pygame.font.SysFont(key[0], key[1], bold=bold)
+            self._fonts[key] = font
+        else:
+            self.hits += 1
+        return font
+
+    def packed_font(self, face, bold=False):
+        """
+        Find the asset pack's font file for a face.
+
+        Names are compared like system font names, ignoring case and spaces.
+
+        Args:
+            face (str): System font name
+            bold (bool): Whether the font is bold
+
+        Returns:
+            tuple: (asset name, whether pygame must embolden it), or None
+            if the pack has no file for the face or cannot be read
+        """
+        if self.pack is None:
+            return None
+        try:
+            names = self.pack.names('fonts')
+        except ValueError:
+            # Use the system fonts rather than fail over a damaged pack
+            return None
+        stems = {}
+        for name in names:
+            stem, extension = os.path.splitext(os.path.basename(name))
+            if extension.lower() in FONT_EXTENSIONS:
+                stems[stem.lower().replace(' ', '')] = name
+        face = face.lower().replace(' ', '')
+        if bold and face + '-bold' in stems:
+            return stems[face + '-bold'], False
+        if face in stems:
+            return stems[face], bold
+        return None
+
+    def prewarm(self, face, sizes, bold=False):
+        """
+        Construct fonts ahead of time so later lookups are all hits.
+
+        Args:
+            face (str): System font name
+            sizes: Iterable of point sizes
+            bold (bool): Whether the fonts are bold
+        """
+        for size in sizes:
+            key = (face, max(1, int(size)), bold)
+            if key not in self._fonts:
+                self.get(face, size, bold)
+
+    def clear(self):
+        """Drop every font, e.g. before pygame is shut down."""
+        self._fonts.clear()
+
+    def reset_stats(self):
+        """Reset the hit/miss counters without dropping any fonts."""
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Number of cached fonts, hits and misses
+        """
+        return {
+            'fonts': len(self._fonts),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def __len__(self):
+        return len(self._fonts)
+
+class FontSet:
+    """
+    The fonts the UI draws its text with at one text size setting.
+
+    One set is built per text size when the UI starts, so changing the text
+    size only switches which set is in use.
+
+    Attributes:
+        text_size (float): The text size scale the set was built for
+        title, hud, card, debug, message, state, icon: The font for each
+            kind of text
+    """
+
+    def __init__(self, registry, text_size, face='Arial'):
+        """
+        Build the fonts for a text size.
+
+        Args:
+            registry (FontRegistry): Where the fonts are constructed and cached
+            text_size (float): Text size scale, e.g. TEXT_SIZE_LARGE
+            face (str): System font name
+        """
+        self.text_size = text_size
+        self.title = registry.get(face, int(36 * text_size), bold=True)
+        self.hud = registry.get(face, int(24 * text_size))
+        self.card = registry.get(face, int(32 * text_size), bold=True)
+        self.debug = registry.get(face, int(16 * text_size), bold=True)
+        self.message = registry.get(face, int(48 * text_size), bold=True)
+        self.state = registry.get(face, int(18 * text_size))
+        self.icon = registry.get(face, int(18 * text_size), bold=True)
+
+# Shared registry used by all UI code
+fonts = FontRegistry(asset_pack)
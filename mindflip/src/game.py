@@ -4,8 +4,9 @@ Game state handler for MindFlip: Memory Arcade
 
 import os
 import random
-import time
 from mindflip.src.card import Card
+from mindflip.src.layout import CardLayout
+from mindflip.src.profiler import profiled
 from mindflip.src.config import (
     HIGH_SCORE_FILE, 
     INITIAL_LIVES, 
@@ -18,7 +19,13 @@ from mindflip.src.config import (
     DEBUG_MODE,
     COMBO_BONUS_MULTIPLIER,
     MAX_COMBO_MULTIPLIER,
-    COMBO_TIMEOUT
+    COMBO_TIMEOUT,
+    WINDOW_WIDTH,
+    WINDOW_HEIGHT,
+    TICK_RATE,
+    MARATHON_MODE,
+    MARATHON_ZOOM_LEVELS,
+    MARATHON_DEFAULT_ZOOM
 )
 
 class Game:
@@ -32,8 +39,22 @@ class Game:
     STATE_DELAY = 2        # Two cards flipped, waiting for delay (match or no match)
     STATE_LEVEL_COMPLETE = 3  # Level completed, showing transition screen
     
-    def __init__(self):
-        """Initialize a new game."""
+    def __init__(self, high_score_file=HIGH_SCORE_FILE, marathon=MARATHON_MODE):
+        """
+        Initialize a new game.
+        
+        Args:
+            high_score_file (str): Where the high score is kept, or None to
+                start from 0 and never save it
+            marathon (bool): Whether to play marathon mode, where the board
+                keeps growing and scrolls
+        """
+        self.high_score_file = high_score_file
+        self.marathon = marathon
+        self.zoom = MARATHON_DEFAULT_ZOOM
+        
+        # Game time in seconds, advanced only by update()
+        self.now = 0.0
         self.reset()
         self.load_high_score()
         self.debug_mode = DEBUG_MODE
@@ -55,6 +76,7 @@ class Game:
         self.match_time = 0
         self.level_complete_time = 0
         self.game_over = False
+        self.game_over_reported = False
         self.level_complete = False
         self.cursor_pos = (0, 0)  # (row, col)
         self.game_state = self.STATE_FIRST_CARD  # Start in first card state
@@ -65,16 +87,24 @@ class Game:
         self.last_match_time = 0
         self.setup_level()
     
-    def calculate_grid_size(self, level):
+    @staticmethod
+    def calculate_grid_size(level, marathon=False):
         """
         Calculate grid size based on level.
         
         Args:
             level: Current game level
+            marathon (bool): Whether marathon mode is on
             
         Returns:
             tuple: (rows, cols) for the grid
         """
+        if marathon:
+            # Add a row and a column every level with no cap, keeping the
+            # card count even; the board scrolls once it outgrows the screen
+            side = level + 1
+            return (side, side + side % 2)
+        
         # Start with 2x2 (4 cards, 2 pairs)
         # Add 2 cards (1 pair) per level
         total_cards = 4 + (level - 1) * 2
@@ -99,11 +129,32 @@ class Game:
         else:  # This shouldn't happen due to the cap, but just in case
             return (4, 6)
     
+    @classmethod
+    def possible_grid_sizes(cls):
+        """
+        List every grid size the level progression can produce.
+        
+        Returns:
+            list: Distinct (rows, cols) tuples in level order
+        """
+        sizes = []
+        level = STARTING_LEVEL
+        while True:
+            grid = cls.calculate_grid_size(level)
+            if grid not in sizes:
+                sizes.append(grid)
+            
+            # The grid stops growing once the card cap is reached
+            if grid[0] * grid[1] >= 24:
+                return sizes
+            level += 1
+    
     def setup_level(self):
         """Set up the current level with appropriate grid size and cards."""
         # Calculate grid size based on level
-        self.grid_size = self.calculate_grid_size(self.level)
+        self.grid_size = self.calculate_grid_size(self.level, self.marathon)
         rows, cols = self.grid_size
+        self.build_layout()
         
         # Reset level state
         self.level_complete = False
@@ -130,6 +181,45 @@ class Game:
         self.first_card = None
         self.second_card = None
     
+    def build_layout(self, width=WINDOW_WIDTH, height=WINDOW_HEIGHT):
+        """
+        Rebuild the card layout for the current grid.
+        
+        Called when the grid changes and should be called again if the window
+        is resized.
+        
+        Args:
+            width (int): Window width in pixels
+            height (int): Window height in pixels
+        """
+        rows, cols = self.grid_size
+        zoom = self.zoom if self.marathon else None
+        self.layout = CardLayout(rows, cols, width, height, zoom)
+    
+    def change_zoom(self, step):
+        """
+        Zoom the marathon board in or out by one of MARATHON_ZOOM_LEVELS.
+        
+        Args:
+            step (int): 1 to zoom in, -1 to zoom out
+            
+        Returns:
+            bool: True if the zoom changed
+        """
+        if not self.marathon:
+            return False
+        
+        levels = MARATHON_ZOOM_LEVELS
+        current = min(range(len(levels)), key=lambda i: abs(levels[i] - self.zoom))
+        index = max(0, min(current + step, len(levels) - 1))
+        if levels[index] == self.zoom:
+            return False
+        
+        self.zoom = levels[index]
+        self.build_layout(self.layout.width, self.layout.height)
+        self.layout.reveal(*self.cursor_pos)
+        return True
+    
     def move_cursor(self, direction):
         """
         Move the cursor in the specified direction.
@@ -150,10 +240,13 @@ class Game:
             col = (col + 1) % cols
         
         self.cursor_pos = (row, col)
+        
+        # Keep the cursor on screen when the board scrolls
+        self.layout.reveal(row, col)
     
     def check_combo(self):
         """Check and update combo status."""
-        current_time = time.time()
+        current_time = self.now
         
         # If it's been too long since the last match, reset combo
         if current_time - self.last_match_time > COMBO_TIMEOUT and self.combo_count > 0:
@@ -170,6 +263,23 @@ class Game:
         multiplier = 1.0 + (self.combo_count * COMBO_BONUS_MULTIPLIER)
         return min(multiplier, MAX_COMBO_MULTIPLIER)
     
+    def flip_card_at(self, row, col):
+        """
+        Move the cursor to a grid position and flip the card there.
+        
+        Args:
+            row (int): Grid row
+            col (int): Grid column
+            
+        Returns:
+            bool: True if a card was flipped, False otherwise
+        """
+        if self.get_card_at(row, col) is None:
+            return False
+        
+        self.cursor_pos = (row, col)
+        return self.flip_card()
+    
     def flip_card(self):
         """
         Flip the card at the current cursor position based on current game state.
@@ -202,7 +312,7 @@ class Game:
             
             # Enter delay state to show both cards
             self.game_state = self.STATE_DELAY
-            self.match_time = time.time()
+            self.match_time = self.now
             
             # Check for match
             if self.first_card.value == self.second_card.value:
@@ -212,7 +322,7 @@ class Game:
                 
                 # Update combo
                 self.combo_count += 1
-                self.last_match_time = time.time()
+                self.last_match_time = self.now
                 
                 # Calculate points with combo multiplier
                 multiplier = self.get_combo_multiplier()
@@ -223,7 +333,7 @@ class Game:
                 # Check if level is complete
                 if self.check_level_complete():
                     self.level_complete = True
-                    self.level_complete_time = time.time()
+                    self.level_complete_time = self.now
                     self.game_state = self.STATE_LEVEL_COMPLETE
                     
                     # Add level bonus
@@ -248,10 +358,14 @@ class Game:
         
         return True
     
-    def update(self):
+    def update(self, dt=1 / TICK_RATE):
         """
-        Update game state, handling card flipping and level transitions.
+        Advance game time by one tick and update the game state, handling
+        card flipping and level transitions.
         
+        Args:
+            dt (float): Seconds of game time the tick covers
+            
         Returns:
             dict: Game state updates including any events that occurred
         """
@@ -262,11 +376,12 @@ class Game:
             'game_over': False,
             'extra_life': False
         }
+        self.now += dt
         
         # Check combo status
         self.check_combo()
         if self.game_state == self.STATE_DELAY:
-            if time.time() - self.match_time > 1.0:  # 1 second delay
+            if self.now - self.match_time > 1.0:  # 1 second delay
                 if self.first_card.matched:
                     # Cards matched - return to first card state
                     updates['match'] = True
@@ -284,7 +399,7 @@ class Game:
         
         # Handle level completion transition
         elif self.game_state == self.STATE_LEVEL_COMPLETE:
-            if time.time() - self.level_complete_time > 2.0:  # 2 second delay for level transition
+            if self.now - self.level_complete_time > 2.0:  # 2 second delay for level transition
                 updates['level_complete'] = True
                 self.level += 1
                 
@@ -294,12 +409,32 @@ class Game:
                 
                 self.setup_level()
         
-        # Handle game over
-        if self.game_over:
+        # Report game over once, on the first tick after it happens
+        if self.game_over and not self.game_over_reported:
             updates['game_over'] = True
+            self.game_over_reported = True
         
         return updates
     
+    def next_deadline(self):
+        """
+        Get the time at which the game state next changes without input.
+        
+        Returns:
+            float: Game time of the earliest pending timer (flip delay,
+            level transition or combo timeout), or None if there is none
+        """
+        deadlines = []
+        if self.game_state == self.STATE_DELAY:
+            deadlines.append(self.match_time + 1.0)
+        elif self.game_state == self.STATE_LEVEL_COMPLETE:
+            deadlines.append(self.level_complete_time + 2.0)
+        
+        if self.combo_count > 0:
+            deadlines.append(self.last_match_time + COMBO_TIMEOUT)
+        
+        return min(deadlines) if deadlines else None
+    
     def check_level_complete(self):
         """Check if all cards have been matched."""
         return all(card.matched for card in self.cards)
@@ -307,30 +442,35 @@ class Game:
     def load_high_score(self):
         """Load the high score from file."""
         self.high_score = 0
+        if self.high_score_file is None:
+            return
         
         # Create data directory if it doesn't exist
         if not os.path.exists(DATA_DIR):
             os.makedirs(DATA_DIR)
             
         try:
-            if os.path.exists(HIGH_SCORE_FILE):
-                with open(HIGH_SCORE_FILE, 'r') as f:
+            if os.path.exists(self.high_score_file):
+                with open(self.high_score_file, 'r') as f:
                     self.high_score = int(f.read().strip())
         except (IOError, ValueError):
             # If there's an error reading the file, start with 0
             self.high_score = 0
     
+    @profiled
     def save_high_score(self):
         """Save the high score to file if current score is higher."""
         if self.score > self.high_score:
             self.high_score = self.score
+            if self.high_score_file is None:
+                return
             
             # Create data directory if it doesn't exist
             if not os.path.exists(DATA_DIR):
                 os.makedirs(DATA_DIR)
                 
             try:
-                with open(HIGH_SCORE_FILE, 'w') as f:
+                with open(self.high_score_file, 'w') as f:
                     f.write(str(self.high_score))
             except IOError:
                 pass  # Silently fail if we can't write the file
@@ -339,6 +479,12 @@ class Game:
         """Toggle debug mode on/off."""
         self.debug_mode = not self.debug_mode
         return self.debug_mode
+    
+    def toggle_marathon_mode(self):
+        """Toggle marathon mode on/off, starting a new game."""
+        self.marathon = not self.marathon
+        self.reset()
+        return self.marathon
         
     def set_text_size(self, size):
         """Set the text size for UI elements."""
@@ -347,7 +493,27 @@ class Game:
     def get_card_at_cursor(self):
         """Get the card at the current cursor position."""
         row, col = self.cursor_pos
-        for card in self.cards:
-            if card.row == row and card.col == col:
-                return card
+        return self.get_card_at(row, col)
+    
+    def get_card_at(self, row, col):
+        """
+        Get the card at a grid position.
+        
+        Cards are created row by row, so the position maps straight to an
+        index in self.cards.
+        
+        Args:
+            row (int): Grid row
+            col (int): Grid column
+            
+        Returns:
+            Card: The card, or None if the position is off the grid or the
+            cell is empty
+        """
+        rows, cols = self.grid_size
+        if not (0 <= row < rows and 0 <= col < cols):
+            return None
+        index = row * cols + col
+        if index < len(self.cards):
+            return self.cards[index]
         return None
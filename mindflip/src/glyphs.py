@@ -0,0 +1,164 @@
+"""
+Glyph atlases for numeric text in MindFlip: Memory Arcade
+"""
+
+import pygame
+from mindflip.src.surfaces import prepare_surface
+
+# Characters numeric fields are made of
+GLYPH_CHARACTERS = "0123456789x.+-:() ♥"
+
+class GlyphAtlas:
+    """
+    Digits and numeric symbols of one font and color rendered once into a strip.
+
+    Numbers are composed from the strip with a single Surface.blits() call,
+    so a counter that changes every frame never rasterizes text. The fixed
+    labels shown in front of numbers are rendered once and kept alongside.
+
+    Glyphs are copied, alpha and all, rather than blended, so text composed
+    onto a new transparent surface keeps its exact edges.
+
+    Attributes:
+        height (int): Height of every glyph
+    """
+
+    def __init__(self, font, color, characters=GLYPH_CHARACTERS):
+        """
+        Render the glyphs into the atlas.
+
+        Args:
+            font (pygame.font.Font): The font to render with
+            color: The text color
+            characters (str): The characters the atlas holds
+        """
+        self.font = font
+        self.color = color
+        self.height = font.get_height()
+
+        rendered = [(char, font.render(char, True, color)) for char in characters]
+        strip = pygame.Surface((sum(glyph.get_width() for _, glyph in rendered), self.height), pygame.SRCALPHA)
+        self._areas = {}
+        x = 0
+        for char, glyph in rendered:
+            strip.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self._areas[char] = pygame.Rect(x, 0, glyph.get_width(), self.height)
+            x += glyph.get_width()
+        self.surface = self._copy_mode(strip)
+        self._labels = {}
+
+    @staticmethod
+    def _copy_mode(surface):
+        """Convert a surface for the atlas and turn its blending off."""
+        surface = prepare_surface(surface, alpha=True)
+        surface.set_alpha(None)
+        return surface
+
+    def supports(self, text):
+        """
+        Check whether text can be composed from the atlas.
+
+        Args:
+            text (str): The text
+
+        Returns:
+            bool: True if every character is in the atlas
+        """
+        return all(char in self._areas for char in text)
+
+    def width(self, text):
+        """
+        Get the width text takes up.
+
+        Args:
+            text (str): Text made of atlas characters
+
+        Returns:
+            int: Width in pixels
+        """
+        areas = self._areas
+        return sum(areas[char].width for char in text)
+
+    def label(self, text):
+        """
+        Get a fixed label rendered in the atlas's font and color.
+
+        Args:
+            text (str): The label, any characters
+
+        Returns:
+            pygame.Surface: The label, rendered on first use
+        """
+        image = self._labels.get(text)
+        if image is None:
+            image = self._labels[text] = self._copy_mode(self.font.render(text, True, self.color))
+        return image
+
+    def render(self, number, label=""):
+        """
+        Compose a number, optionally after a label, onto a new surface.
+
+        Args:
+            number (str): Text made of atlas characters
+            label (str): Fixed text shown in front of the number
+
+        Returns:
+            pygame.Surface: The transparent text, in the display pixel format
+        """
+        blits = []
+        x = 0
+        height = self.height
+        if label:
+            label_image = self.label(label)
+            blits.append((label_image, (0, 0)))
+            x = label_image.get_width()
+            height = max(height, label_image.get_height())
+
+        areas = self._areas
+        for char in number:
+            area = areas[char]
+            blits.append((self.surface, (x, 0), area))
+            x += area.width
+
+        image = pygame.Surface((x, height), pygame.SRCALPHA, self.surface)
+        image.blits(blits, doreturn=False)
+        return image
+
+class GlyphCache:
+    """
+    Shared glyph atlases keyed by font and color.
+
+    Like the text cache, atlases are keyed by font id; fonts come from the
+    shared FontRegistry and live for the whole program.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._atlases = {}
+
+    def get(self, font, color):
+        """
+        Get the atlas of a font and color, building it on first use.
+
+        Args:
+            font (pygame.font.Font): The font
+            color: The text color
+
+        Returns:
+            GlyphAtlas: The atlas
+        """
+        key = (id(font), tuple(color))
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            atlas = self._atlases[key] = GlyphAtlas(font, color)
+        return atlas
+
+    def clear(self):
+        """Drop every atlas."""
+        self._atlases.clear()
+
+    def __len__(self):
+        return len(self._atlases)
+
+# Shared atlases used by all UI code
+glyphs = GlyphCache()
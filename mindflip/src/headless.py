@@ -0,0 +1,331 @@
+"""
+Headless benchmark runner for MindFlip: Memory Arcade
+
+Drives the real Game and UI off-screen through SDL's dummy video driver,
+replaying a scripted input sequence and timing every rendered frame:
+
+    python -m mindflip.src.headless --frames 600 --hashes --csv frames.csv
+
+A script has one input per line, "<frame> <action> [args]", where the
+action is one of:
+
+    key <name>     press and release a key, e.g. "key return" or "key right"
+    move <x> <y>   move the mouse
+    click <x> <y>  move the mouse there and click the left button
+    wheel <x> <y>  turn the mouse wheel, e.g. "wheel 0 -1" to scroll down
+    quit           stop the run
+
+Blank lines and lines starting with # are ignored.
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import statistics
+import sys
+import time
+import pygame
+from mindflip.src.config import WINDOW_WIDTH, WINDOW_HEIGHT, FPS
+from mindflip.src.clock import clock
+from mindflip.src.scheduler import FixedTimestep
+from mindflip.src.profiler import profiler, percentile
+from mindflip.src.fonts import fonts
+from mindflip.src.text_cache import text_cache
+from mindflip.src.glyphs import glyphs
+from mindflip.src.card_faces import card_faces
+from mindflip.src.game import Game
+from mindflip.src.ui import UI
+from mindflip.src.main import handle_event, update_hover, update_game, render_frame
+
+def default_script():
+    """
+    Build the session played when no script is given.
+
+    It starts the game, peeks at a tooltip and then keeps flipping cards
+    while walking the cursor over the grid.
+
+    Returns:
+        list: Script lines
+    """
+    lines = ["5 key return", "10 move 740 40", "40 move 400 300"]
+    frame = 60
+    for step in range(100):
+        lines.append(f"{frame} key return")
+        lines.append(f"{frame + 20} key {'down' if step % 3 == 2 else 'right'}")
+        frame += 40
+    return lines
+
+def parse_script(lines):
+    """
+    Parse an input script into pygame events grouped by frame.
+
+    Args:
+        lines: Iterable of script lines
+
+    Returns:
+        dict: Frame number to the list of pygame events delivered on it
+
+    Raises:
+        ValueError: If a line cannot be parsed
+    """
+    script = {}
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        parts = line.split()
+        try:
+            frame, action, args = int(parts[0]), parts[1], parts[2:]
+            if action == 'key':
+                key = pygame.key.key_code(' '.join(args))
+                events = [
+                    pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode='', scancode=0),
+                    pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode='', scancode=0)
+                ]
+            elif action in ('move', 'click'):
+                pos = (int(args[0]), int(args[1]))
+                events = [pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0))]
+                if action == 'click':
+                    events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+                    events.append(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=1))
+            elif action == 'wheel':
+                events = [pygame.event.Event(pygame.MOUSEWHEEL, x=int(args[0]), y=int(args[1]), flipped=False)]
+            elif action == 'quit':
+                events = [pygame.event.Event(pygame.QUIT)]
+            else:
+                raise ValueError(f"unknown action '{action}'")
+        except (IndexError, ValueError) as error:
+            raise ValueError(f"script line {line_number}: {line!r}: {error}") from None
+
+        script.setdefault(frame, []).extend(events)
+    return script
+
+def clear_shared_caches():
+    """
+    Drop the fonts and surfaces held by the shared module-level caches.
+
+    They outlive a runner, but what they hold belongs to the pygame session
+    that made it and must not be used after pygame.quit(), so a later runner
+    in the same process has to start from empty caches.
+    """
+    fonts.clear()
+    text_cache.clear()
+    glyphs.clear()
+    card_faces.clear()
+
+class HeadlessRunner:
+    """
+    Plays a scripted session of the real game off-screen, one frame at a time.
+
+    The shared game clock is driven by the frame counter instead of the wall
+    clock, and every random source is seeded, so two runs of the same script
+    render exactly the same frames however fast the machine is.
+
+    Attributes:
+        timings (list): Render time of every frame in milliseconds
+        hashes (list): SHA-1 of every frame's pixels when hashing is on
+    """
+
+    def __init__(self, script, seed=0, fps=FPS, hashes=False, dirty_rendering=None, profile=False):
+        """
+        Set up the game and UI on an off-screen display.
+
+        Args:
+            script: Iterable of script lines, see parse_script()
+            seed: Random seed for the card shuffle and visual effects
+            fps (int): Simulated frame rate driving the game clock
+            hashes (bool): Whether to hash every rendered frame
+            dirty_rendering (bool): Override the dirty-rectangle setting
+            profile (bool): Whether to break frames down with the profiler
+        """
+        self.fps = fps
+        self.hash_frames = hashes
+        self.frame = 0
+        self.timings = []
+        self.hashes = []
+
+        # Time advances by exactly one frame per frame
+        clock.set_source(lambda: self.frame / self.fps)
+
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+        pygame.init()
+        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.script = parse_script(script)
+
+        random.seed(seed)
+        self.game = Game(high_score_file=None)
+        self.ui = UI(seed=seed)
+        if dirty_rendering is not None:
+            self.ui.dirty_rendering = dirty_rendering
+        self.game_started = False
+        self.mouse_pos = (0, 0)
+        self.timestep = FixedTimestep()
+        profiler.reset()
+        profiler.enabled = profile
+
+    def step(self):
+        """
+        Play the script's input for the next frame and render it.
+
+        Returns:
+            bool: False if the script quit instead of rendering a frame
+        """
+        profiler.begin_frame()
+        quit_requested = False
+        with profiler.phase('events'):
+            for event in self.script.get(self.frame, ()):
+                if hasattr(event, 'pos'):
+                    self.mouse_pos = event.pos
+                requested, self.game_started = handle_event(event, self.game, self.ui, self.game_started)
+                quit_requested = quit_requested or requested
+            update_hover(self.ui, self.game_started, self.mouse_pos)
+        if quit_requested:
+            return False
+
+        if self.game_started:
+            with profiler.phase('update'):
+                for dt in self.timestep.steps(clock.now()):
+                    update_game(self.game, self.ui, dt)
+        else:
+            self.timestep.skip(clock.now())
+
+        start = time.perf_counter()
+        render_frame(self.screen, self.game, self.ui, self.game_started)
+        self.timings.append((time.perf_counter() - start) * 1000)
+        profiler.end_frame()
+
+        if self.hash_frames:
+            pixels = pygame.image.tobytes(self.screen, 'RGB')
+            self.hashes.append(hashlib.sha1(pixels).hexdigest())
+
+        self.frame += 1
+        return True
+
+    def run(self, frames):
+        """
+        Play the script for a number of frames or until it quits.
+
+        Args:
+            frames (int): Most frames to render
+
+        Returns:
+            list: Render time of every frame in milliseconds
+        """
+        while self.frame < frames and self.step():
+            pass
+        return self.timings
+
+    def close(self):
+        """
+        Shut pygame down and give the game clock back to the wall clock.
+
+        The shared caches are emptied too, so another runner can be started
+        in the same process afterwards.
+        """
+        clock.set_source()
+        profiler.enabled = False
+        self.game = None
+        self.ui = None
+        clear_shared_caches()
+        pygame.quit()
+
+    def summary(self):
+        """
+        Summarize the frame timings.
+
+        Returns:
+            dict: Frame count, total seconds, mean/percentile/max milliseconds
+            and the frames per second the renderer managed
+        """
+        timings = sorted(self.timings)
+        if not timings:
+            return {'frames': 0}
+        total = sum(timings) / 1000
+        return {
+            'frames': len(timings),
+            'total': total,
+            'mean': statistics.fmean(timings),
+            'p50': percentile(timings, 0.50),
+            'p95': percentile(timings, 0.95),
+            'p99': percentile(timings, 0.99),
+            'max': timings[-1],
+            'fps': len(timings) / total if total else float('inf')
+        }
+
+    def run_hash(self):
+        """
+        Get one hash covering every frame hash, for comparing whole runs.
+
+        Returns:
+            str: SHA-1 hex digest, or None if frames were not hashed
+        """
+        if not self.hash_frames:
+            return None
+        return hashlib.sha1(''.join(self.hashes).encode()).hexdigest()
+
+    def write_csv(self, path):
+        """
+        Write one line per frame with its render time and hash.
+
+        Args:
+            path (str): Output file
+        """
+        with open(path, 'w') as f:
+            f.write("frame,render_ms,hash\n")
+            for frame, timing in enumerate(self.timings):
+                frame_hash = self.hashes[frame] if self.hash_frames else ''
+                f.write(f"{frame},{timing:.4f},{frame_hash}\n")
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Replay a scripted MindFlip session off-screen and time every frame.")
+    parser.add_argument('--frames', type=int, default=600, help="frames to render (default: 600)")
+    parser.add_argument('--script', help="input script file (default: a built-in session)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument('--fps', type=int, default=FPS, help=f"simulated frame rate (default: {FPS})")
+    parser.add_argument('--hashes', action='store_true', help="hash every frame's pixels")
+    parser.add_argument('--dirty-rects', action='store_true', help="render with dirty rectangles")
+    parser.add_argument('--csv', help="write per-frame timings (and hashes) to this file")
+    parser.add_argument('--profile', action='store_true', help="break frames down into phases")
+    args = parser.parse_args(argv)
+
+    if args.script:
+        with open(args.script) as f:
+            script = f.read().splitlines()
+    else:
+        script = default_script()
+
+    try:
+        runner = HeadlessRunner(script, args.seed, args.fps, args.hashes,
+                                dirty_rendering=True if args.dirty_rects else None,
+                                profile=args.profile)
+    except ValueError as error:
+        parser.error(str(error))
+    try:
+        runner.run(args.frames)
+    finally:
+        runner.close()
+
+    stats = runner.summary()
+    if not stats['frames']:
+        print("No frames rendered")
+        return 1
+    print(f"frames: {stats['frames']}  total: {stats['total']:.2f}s  "
+          f"mean: {stats['mean']:.2f} ms  p50: {stats['p50']:.2f} ms  p95: {stats['p95']:.2f} ms  "
+          f"p99: {stats['p99']:.2f} ms  max: {stats['max']:.2f} ms  ({stats['fps']:.0f} frames/s)")
+    if args.profile:
+        # Every phase, slowest p95 first
+        print(f"{'phase':<28}{'p50':>8}{'p95':>8}{'p99':>8}  (ms)")
+        for name, p50, p95, p99 in sorted(profiler.stats(), key=lambda row: row[2], reverse=True):
+            print(f"{name:<28}{p50:8.3f}{p95:8.3f}{p99:8.3f}")
+    if args.hashes:
+        print(f"run hash: {runner.run_hash()}")
+    if args.csv:
+        runner.write_csv(args.csv)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
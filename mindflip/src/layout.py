@@ -0,0 +1,271 @@
+"""
+Card grid layout for MindFlip: Memory Arcade
+"""
+
+import pygame
+from mindflip.src.config import (
+    WINDOW_WIDTH, WINDOW_HEIGHT, CARD_WIDTH, CARD_HEIGHT, CARD_MARGIN
+)
+
+# Top of the card grid, below the HUD
+GRID_TOP = 120
+
+class CardLayout:
+    """
+    Precomputed geometry of the card grid for one grid size.
+    
+    Built whenever the grid changes so card sizes are worked out once instead
+    of every frame. Rendering and input both read card positions from here.
+    
+    By default the cards are sized so the whole grid fits on screen. With a
+    zoom the cards keep a fixed size instead, and a grid larger than the
+    viewport (the screen area below the HUD) scrolls inside it. Card
+    positions are computed from the grid origin and pitch, and only the
+    cells inside the viewport are drawn or hit-tested, so the cost of a
+    frame does not depend on the size of the grid.
+    
+    Attributes:
+        rows (int): Number of grid rows
+        cols (int): Number of grid columns
+        card_width (int): Card width in pixels
+        card_height (int): Card height in pixels
+        font_scale (float): Scale of card fonts and decorations
+        highlight_thickness (int): Width of the cursor highlight border
+        viewport (pygame.Rect): Screen area the grid is shown in
+        scrollable (bool): Whether the grid is larger than the viewport
+        clip_rect (pygame.Rect): Area cards are clipped to when drawn
+        scroll_x (int): Horizontal scroll offset in pixels
+        scroll_y (int): Vertical scroll offset in pixels
+    """
+    
+    def __init__(self, rows, cols, width=WINDOW_WIDTH, height=WINDOW_HEIGHT, zoom=None):
+        """
+        Lay out a grid.
+        
+        Args:
+            rows (int): Number of grid rows
+            cols (int): Number of grid columns
+            width (int): Window width in pixels
+            height (int): Window height in pixels
+            zoom (float): Card size relative to CARD_WIDTH x CARD_HEIGHT, or
+                None to fit the whole grid on screen
+        """
+        self.rows = rows
+        self.cols = cols
+        self.width = width
+        self.height = height
+        self.viewport = grid_viewport(width, height)
+        
+        if zoom is None:
+            card_width, card_height = calculate_card_size(rows, cols, width, height)
+        else:
+            card_width, card_height = CARD_WIDTH * zoom, CARD_HEIGHT * zoom
+        self.card_width = int(card_width)
+        self.card_height = int(card_height)
+        self.font_scale = min(self.card_width / CARD_WIDTH, 1.0)
+        self.highlight_thickness = max(1, int(3 * self.font_scale))
+        
+        # Cards sit on a whole-pixel pitch so positions map back to cells exactly
+        self.pitch_x = self.card_width + CARD_MARGIN
+        self.pitch_y = self.card_height + CARD_MARGIN
+        
+        # Center the grid on screen, below the HUD; a grid wider than the
+        # viewport starts at its left edge instead
+        grid_width = cols * self.pitch_x - CARD_MARGIN
+        grid_height = rows * self.pitch_y - CARD_MARGIN
+        if grid_width > self.viewport.width:
+            self.origin_x = self.viewport.x
+        else:
+            self.origin_x = (width - grid_width) // 2
+        self.origin_y = GRID_TOP
+        
+        # A grid that does not fit scrolls, and is clipped to the viewport
+        self.max_scroll_x = max(0, grid_width - self.viewport.width)
+        self.max_scroll_y = max(0, grid_height - self.viewport.height)
+        self.scrollable = bool(self.max_scroll_x or self.max_scroll_y)
+        self.clip_rect = self.viewport if self.scrollable else pygame.Rect(0, 0, width, height)
+        self.scroll_x = 0
+        self.scroll_y = 0
+        self.start_x = self.origin_x
+        self.start_y = self.origin_y
+    
+    def card_rect(self, row, col):
+        """
+        Get the rect of the card at a grid position.
+        
+        Args:
+            row (int): Grid row
+            col (int): Grid column
+            
+        Returns:
+            pygame.Rect: The card's screen rect
+        """
+        return pygame.Rect(self.start_x + col * self.pitch_x, self.start_y + row * self.pitch_y,
+                           self.card_width, self.card_height)
+    
+    def cell_at(self, pos):
+        """
+        Find the grid cell under a screen position.
+        
+        The cell is computed directly from the grid origin and pitch, so the
+        cost does not depend on the number of cards.
+        
+        Args:
+            pos: (x, y) screen position
+            
+        Returns:
+            tuple: (row, col) of the card under pos, or None if pos is outside
+            the grid or the viewport, or in the margin between cards
+        """
+        if not self.clip_rect.collidepoint(pos):
+            return None
+        col = (pos[0] - self.start_x) // self.pitch_x
+        row = (pos[1] - self.start_y) // self.pitch_y
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return None
+        if not self.card_rect(row, col).collidepoint(pos):
+            return None
+        return (row, col)
+    
+    def highlight_rect(self, row, col):
+        """
+        Get the rect of the cursor highlight around a card.
+        
+        Args:
+            row (int): Grid row
+            col (int): Grid column
+            
+        Returns:
+            pygame.Rect: The highlight border's outer rect
+        """
+        thickness = self.highlight_thickness
+        return self.card_rect(row, col).inflate(thickness * 2, thickness * 2)
+    
+    def visible_cells(self):
+        """
+        Get the cells at least partly inside the viewport.
+        
+        Returns:
+            tuple: (rows, cols) ranges; every cell of the grid when it fits
+        """
+        if not self.scrollable:
+            return range(self.rows), range(self.cols)
+        
+        view = self.viewport
+        first_row = max(0, (view.top - self.start_y) // self.pitch_y)
+        last_row = min(self.rows - 1, (view.bottom - 1 - self.start_y) // self.pitch_y)
+        first_col = max(0, (view.left - self.start_x) // self.pitch_x)
+        last_col = min(self.cols - 1, (view.right - 1 - self.start_x) // self.pitch_x)
+        return range(first_row, last_row + 1), range(first_col, last_col + 1)
+    
+    def clip(self, image, rect):
+        """
+        Cut an image placed on the grid down to the part inside clip_rect.
+        
+        Args:
+            image (pygame.Surface): The image
+            rect (pygame.Rect): Where the image is placed
+            
+        Returns:
+            tuple: (pygame.Surface, pygame.Rect) of the visible part; the
+            image is a subsurface when it had to be cut
+        """
+        if self.clip_rect.contains(rect):
+            return image, rect
+        visible = rect.clip(self.clip_rect)
+        if not visible:
+            return pygame.Surface((0, 0)), visible
+        return image.subsurface(visible.move(-rect.x, -rect.y)), visible
+    
+    def scroll_to(self, x, y):
+        """
+        Scroll the grid, keeping it covering the viewport.
+        
+        Args:
+            x (int): Horizontal scroll offset in pixels
+            y (int): Vertical scroll offset in pixels
+            
+        Returns:
+            bool: True if the grid moved
+        """
+        x = max(0, min(int(x), self.max_scroll_x))
+        y = max(0, min(int(y), self.max_scroll_y))
+        if (x, y) == (self.scroll_x, self.scroll_y):
+            return False
+        self.scroll_x, self.scroll_y = x, y
+        self.start_x = self.origin_x - x
+        self.start_y = self.origin_y - y
+        return True
+    
+    def scroll_by(self, dx, dy):
+        """
+        Scroll the grid relative to where it is.
+        
+        Args:
+            dx (int): Pixels to scroll right
+            dy (int): Pixels to scroll down
+            
+        Returns:
+            bool: True if the grid moved
+        """
+        return self.scroll_to(self.scroll_x + dx, self.scroll_y + dy)
+    
+    def reveal(self, row, col):
+        """
+        Scroll just far enough to bring a card fully into the viewport.
+        
+        Args:
+            row (int): Grid row
+            col (int): Grid column
+        """
+        if not self.scrollable:
+            return
+        
+        rect = self.highlight_rect(row, col)
+        view = self.viewport
+        dx = min(0, rect.left - view.left) or max(0, rect.right - view.right)
+        dy = min(0, rect.top - view.top) or max(0, rect.bottom - view.bottom)
+        self.scroll_by(dx, dy)
+
+def grid_viewport(width=WINDOW_WIDTH, height=WINDOW_HEIGHT):
+    """
+    Get the screen area the card grid is shown in.
+    
+    Args:
+        width (int): Window width in pixels
+        height (int): Window height in pixels
+        
+    Returns:
+        pygame.Rect: The area between the HUD and the controls
+    """
+    return pygame.Rect(20, GRID_TOP, width - 40, height - 200)
+
+def calculate_card_size(rows, cols, width=WINDOW_WIDTH, height=WINDOW_HEIGHT):
+    """
+    Calculate the card size that fits a grid on screen.
+    
+    Args:
+        rows (int): Number of grid rows
+        cols (int): Number of grid columns
+        width (int): Window width in pixels
+        height (int): Window height in pixels
+        
+    Returns:
+        tuple: (card_width, card_height)
+    """
+    # Calculate available space for the grid
+    available_width = width - 40  # 20px margin on each side
+    available_height = height - 200  # Space for HUD and controls
+    
+    # Calculate card dimensions to fit within available space
+    card_width = min(CARD_WIDTH, (available_width - (cols-1) * CARD_MARGIN) / cols)
+    card_height = min(CARD_HEIGHT, (available_height - (rows-1) * CARD_MARGIN) / rows)
+    
+    # Maintain aspect ratio
+    aspect_ratio = CARD_WIDTH / CARD_HEIGHT
+    if card_width / card_height > aspect_ratio:
+        card_width = card_height * aspect_ratio
+    else:
+        card_height = card_width / aspect_ratio
+    
+    return card_width, card_height
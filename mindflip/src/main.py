@@ -6,19 +6,216 @@ import sys
 import pygame
 from mindflip.src.game import Game
 from mindflip.src.ui import UI
+from mindflip.src.scheduler import FrameScheduler, FixedTimestep
+from mindflip.src.clock import clock
+from mindflip.src.profiler import profiler
 from mindflip.src.config import (
     WINDOW_WIDTH, WINDOW_HEIGHT, FPS, GAME_TITLE, 
     MATCH_POINTS, LEVEL_BONUS,
-    TEXT_SIZE_SMALL, TEXT_SIZE_MEDIUM, TEXT_SIZE_LARGE
+    TEXT_SIZE_SMALL, TEXT_SIZE_MEDIUM, TEXT_SIZE_LARGE,
+    SCROLL_STEP
 )
 
+def show_flip_feedback(game, ui):
+    """
+    Show the toast message matching the state a card flip left the game in.
+    
+    Args:
+        game: The game state object
+        ui: The UI object
+    """
+    if game.game_state == game.STATE_SECOND_CARD:
+        ui.show_toast("Find a matching card!")
+    elif game.game_state == game.STATE_DELAY:
+        if game.first_card.value == game.second_card.value:
+            # Show combo message if applicable
+            if game.combo_count > 1:
+                multiplier = game.get_combo_multiplier()
+                points = int(MATCH_POINTS * multiplier)
+                ui.show_toast(f"Match found! +{points} points (Combo x{game.combo_count})")
+            else:
+                ui.show_toast(f"Match found! +{MATCH_POINTS} points")
+            ui.burst_match(game)
+        else:
+            ui.show_toast("Not a match! Try again")
+
+def handle_event(event, game, ui, game_started):
+    """
+    Apply one input event to the game and UI.
+    
+    Args:
+        event: The pygame event
+        game: The game state object
+        ui: The UI object
+        game_started (bool): Whether the game screen is showing
+        
+    Returns:
+        tuple: (quit requested, whether the game screen is showing afterwards)
+    """
+    quit_requested = False
+    
+    if event.type == pygame.QUIT:
+        quit_requested = True
+    
+    elif event.type == pygame.KEYDOWN:
+        if not game_started:
+            # Start game on Enter press from splash screen
+            if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+                game_started = True
+                ui.show_toast("Game started! Find matching pairs")
+            elif event.key == pygame.K_m:
+                # Toggle marathon mode
+                marathon_on = game.toggle_marathon_mode()
+                ui.show_toast(f"Marathon mode {'enabled' if marathon_on else 'disabled'}")
+        else:
+            # Game controls
+            if event.key == pygame.K_UP:
+                game.move_cursor('up')
+            elif event.key == pygame.K_DOWN:
+                game.move_cursor('down')
+            elif event.key == pygame.K_LEFT:
+                game.move_cursor('left')
+            elif event.key == pygame.K_RIGHT:
+                game.move_cursor('right')
+            elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER, pygame.K_SPACE):
+                if game.flip_card():
+                    # Show appropriate toast messages based on game state
+                    show_flip_feedback(game, ui)
+            elif event.key == pygame.K_r:
+                game.reset()
+                ui.show_toast("Game reset! Starting from level 1")
+            elif event.key == pygame.K_q:
+                quit_requested = True
+            elif event.key == pygame.K_d:
+                # Toggle debug mode
+                debug_on = game.toggle_debug_mode()
+                ui.show_toast(f"Debug mode {'enabled' if debug_on else 'disabled'}")
+            elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                # Zoom the marathon board in
+                game.change_zoom(1)
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                # Zoom the marathon board out
+                game.change_zoom(-1)
+            elif event.key == pygame.K_p and game.debug_mode:
+                # Toggle the particle stress test
+                stress_on = ui.toggle_particle_stress()
+                ui.show_toast(f"Particle stress test {'started' if stress_on else 'stopped'}")
+            elif event.key == pygame.K_ESCAPE or event.key == pygame.K_b:
+                # Return to main menu
+                game_started = False
+                game.reset()  # Reset the game state
+                ui.leave_game()
+                ui.show_toast("Returned to main menu")
+    
+    # Handle splash screen button events
+    if not game_started:
+        if ui.handle_splash_events(event, game):
+            # Debug mode was toggled, update UI
+            pass
+    else:
+        # Handle game screen events (info icons)
+        ui.handle_game_events(event)
+        
+        # Scroll a board larger than the screen; Shift scrolls sideways.
+        # SDL's wheel y is positive when scrolling up, x when scrolling right
+        if event.type == pygame.MOUSEWHEEL:
+            dx, dy = event.x, -event.y
+            if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+                dx, dy = dy, dx
+            game.layout.scroll_by(dx * SCROLL_STEP, dy * SCROLL_STEP)
+        
+        # Flip the card under a left click
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            cell = game.layout.cell_at(event.pos)
+            if cell and game.flip_card_at(*cell):
+                show_flip_feedback(game, ui)
+        
+        # Handle text size button clicks
+        if ui.handle_text_size_buttons(event, game):
+            size_name = "Small" if game.text_size == TEXT_SIZE_SMALL else "Large" if game.text_size == TEXT_SIZE_LARGE else "Medium"
+            ui.show_toast(f"Text size: {size_name}")
+        
+        # Check for back button click
+        if event.type == pygame.MOUSEBUTTONDOWN and ui.back_button.check_hover(event.pos):
+            game_started = False
+            game.reset()  # Reset the game state
+            ui.leave_game()
+            ui.show_toast("Returned to main menu")
+    
+    return quit_requested, game_started
+
+def update_hover(ui, game_started, mouse_pos):
+    """
+    Update the hover state of the buttons and icons on the current screen.
+    
+    Args:
+        ui: The UI object
+        game_started (bool): Whether the game screen is showing
+        mouse_pos: The mouse position
+    """
+    if not game_started:
+        ui.debug_button.check_hover(mouse_pos)
+        ui.rules_icon.check_hover(mouse_pos)
+        ui.points_icon.check_hover(mouse_pos)
+    else:
+        # Check icon hovers during gameplay
+        ui.rules_icon.check_hover(mouse_pos)
+        ui.points_icon.check_hover(mouse_pos)
+        ui.back_button.check_hover(mouse_pos)
+        
+        # Check text size buttons
+        for button in ui.text_size_buttons:
+            button.check_hover(mouse_pos)
+
+def update_game(game, ui, dt):
+    """
+    Advance the game state by one tick and show toast messages for what happened.
+    
+    Args:
+        game: The game state object
+        ui: The UI object
+        dt (float): Seconds of game time the tick covers
+    """
+    updates = game.update(dt)
+    
+    # Show toast messages for game events
+    if updates['level_complete']:
+        ui.show_toast(f"Level {game.level-1} complete! Moving to level {game.level}")
+    elif updates['game_over']:
+        ui.show_toast("Game over! Press R to restart")
+    elif updates['extra_life']:
+        ui.show_toast("Extra life awarded! ♥")
+
+def render_frame(screen, game, ui, game_started):
+    """
+    Draw the current screen and push it to the display.
+    
+    Args:
+        screen: The pygame screen to draw on
+        game: The game state object
+        ui: The UI object
+        game_started (bool): Whether the game screen is showing
+    """
+    if not game_started:
+        ui.draw_splash_screen(screen, game.debug_mode, game.marathon)
+    else:
+        ui.draw_game(game, screen)
+    
+    # Update display
+    with profiler.phase('flip'):
+        if ui.dirty_rendering:
+            pygame.display.update(ui.dirty_rects)
+        else:
+            pygame.display.flip()
+
 def main():
     """Main entry point for the game."""
     # Initialize pygame
     pygame.init()
     screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption(GAME_TITLE)
-    clock = pygame.time.Clock()
+    scheduler = FrameScheduler(FPS)
+    timestep = FixedTimestep()
     
     # Create game objects
     game = Game()
@@ -27,120 +224,52 @@ def main():
     # Game state
     game_started = False
     running = True
+    animating = True
+    deadline = None
     
     # Main game loop
     while running:
-        # Handle events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            
-            elif event.type == pygame.KEYDOWN:
-                if not game_started:
-                    # Start game on Enter press from splash screen
-                    if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
-                        game_started = True
-                        ui.show_toast("Game started! Find matching pairs")
-                else:
-                    # Game controls
-                    if event.key == pygame.K_UP:
-                        game.move_cursor('up')
-                    elif event.key == pygame.K_DOWN:
-                        game.move_cursor('down')
-                    elif event.key == pygame.K_LEFT:
-                        game.move_cursor('left')
-                    elif event.key == pygame.K_RIGHT:
-                        game.move_cursor('right')
-                    elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER, pygame.K_SPACE):
-                        if game.flip_card():
-                            # Show appropriate toast messages based on game state
-                            if game.game_state == game.STATE_SECOND_CARD:
-                                ui.show_toast("Find a matching card!")
-                            elif game.game_state == game.STATE_DELAY:
-                                if game.first_card.value == game.second_card.value:
-                                    # Show combo message if applicable
-                                    if game.combo_count > 1:
-                                        multiplier = game.get_combo_multiplier()
-                                        points = int(MATCH_POINTS * multiplier)
-                                        ui.show_toast(f"Match found! +{points} points (Combo x{game.combo_count})")
-                                    else:
-                                        ui.show_toast(f"Match found! +{MATCH_POINTS} points")
-                                else:
-                                    ui.show_toast("Not a match! Try again")
-                    elif event.key == pygame.K_r:
-                        game.reset()
-                        ui.show_toast("Game reset! Starting from level 1")
-                    elif event.key == pygame.K_q:
-                        running = False
-                    elif event.key == pygame.K_d:
-                        # Toggle debug mode
-                        debug_on = game.toggle_debug_mode()
-                        ui.show_toast(f"Debug mode {'enabled' if debug_on else 'disabled'}")
-                    elif event.key == pygame.K_ESCAPE or event.key == pygame.K_b:
-                        # Return to main menu
-                        game_started = False
-                        game.reset()  # Reset the game state
-                        ui.show_toast("Returned to main menu")
-            
-            # Handle splash screen button events
-            if not game_started:
-                if ui.handle_splash_events(event, game):
-                    # Debug mode was toggled, update UI
-                    pass
-            else:
-                # Handle game screen events (info icons)
-                ui.handle_game_events(event)
-                
-                # Handle text size button clicks
-                if ui.handle_text_size_buttons(event, game):
-                    size_name = "Small" if game.text_size == TEXT_SIZE_SMALL else "Large" if game.text_size == TEXT_SIZE_LARGE else "Medium"
-                    ui.show_toast(f"Text size: {size_name}")
-                
-                # Check for back button click
-                if event.type == pygame.MOUSEBUTTONDOWN and ui.back_button.check_hover(pygame.mouse.get_pos()):
-                    game_started = False
-                    game.reset()  # Reset the game state
-                    ui.show_toast("Returned to main menu")
+        # Wait for the next frame; when nothing is animating this sleeps
+        # until input arrives or the next game timer is due
+        events = scheduler.next_events(animating, deadline)
         
-        # Update mouse position for button hover effects
-        mouse_pos = pygame.mouse.get_pos()
-        if not game_started:
-            ui.debug_button.check_hover(mouse_pos)
-            ui.rules_icon.check_hover(mouse_pos)
-            ui.points_icon.check_hover(mouse_pos)
-        else:
-            # Check icon hovers during gameplay
-            ui.rules_icon.check_hover(mouse_pos)
-            ui.points_icon.check_hover(mouse_pos)
-            ui.back_button.check_hover(mouse_pos)
-            
-            # Check text size buttons
-            for button in ui.text_size_buttons:
-                button.check_hover(mouse_pos)
+        # Profile the frame while debug mode is on. Timing starts after the
+        # wait so idle sleeps do not show up as slow frames; only the frame
+        # rate cap's sleep counts, as a phase of its own
+        profiler.enabled = game.debug_mode
+        profiler.begin_frame()
+        profiler.add('tick wait', scheduler.tick_wait)
         
-        # Update game state
-        if game_started:
-            updates = game.update()
+        # Handle events
+        with profiler.phase('events'):
+            for event in events:
+                quit_requested, game_started = handle_event(event, game, ui, game_started)
+                if quit_requested:
+                    running = False
             
-            # Show toast messages for game events
-            if updates['level_complete']:
-                ui.show_toast(f"Level {game.level-1} complete! Moving to level {game.level}")
-            elif updates['game_over']:
-                ui.show_toast("Game over! Press R to restart")
-            elif updates['extra_life']:
-                ui.show_toast("Extra life awarded! ♥")
+            # Update mouse position for button hover effects
+            update_hover(ui, game_started, pygame.mouse.get_pos())
         
-        # Render
-        if not game_started:
-            ui.draw_splash_screen(screen, game.debug_mode)
+        # Advance the game logic by as many fixed ticks as real time allows;
+        # time spent on the splash screen does not count
+        if game_started:
+            with profiler.phase('update'):
+                for dt in timestep.steps(clock.now()):
+                    update_game(game, ui, dt)
         else:
-            ui.draw_game(game, screen)
+            timestep.skip(clock.now())
         
-        # Update display
-        pygame.display.flip()
+        # Render
+        render_frame(screen, game, ui, game_started)
         
-        # Cap the frame rate
-        clock.tick(FPS)
+        # Work out whether the next frame can wait for input
+        animating = ui.is_animating()
+        deadline = game.next_deadline() if game_started else None
+        if deadline is not None:
+            # Game timers run on game time and fire on a tick; convert to
+            # when that tick is due on the scheduler's clock
+            deadline = timestep.due_time(deadline - game.now)
+        profiler.end_frame()
     
     # Clean up
     pygame.quit()
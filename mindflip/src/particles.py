@@ -0,0 +1,143 @@
+"""
+Particle effects for MindFlip: Memory Arcade
+"""
+
+import numpy as np
+import pygame
+
+# Downward pull on particles in pixels per second squared
+PARTICLE_GRAVITY = 300.0
+
+class ParticleSystem:
+    """
+    A fixed-capacity pool of particles stored in NumPy arrays.
+
+    Position, velocity, remaining life and color are preallocated for every
+    slot. New particles are written into the pool as a ring, overwriting the
+    oldest ones once it is full, and all particles are moved, aged, culled
+    and drawn with array operations, so effects never create per-particle
+    Python objects.
+
+    Attributes:
+        capacity (int): Number of particle slots
+        live (int): Number of particles still alive after the last update
+    """
+
+    def __init__(self, capacity, width, height, seed=None):
+        """
+        Create an empty particle pool.
+
+        Args:
+            capacity (int): Number of particle slots
+            width (int): Width of the area particles live in
+            height (int): Height of the area particles live in
+            seed: Optional random seed
+        """
+        self.capacity = capacity
+        self.width = width
+        self.height = height
+        self.rng = np.random.default_rng(seed)
+        self.position = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.ones(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.float32)
+        self.live = 0
+        self._next = 0
+        self._step = np.zeros((capacity, 2), dtype=np.float32)
+
+    def __len__(self):
+        return self.live
+
+    def emit(self, count, x, y, colors, speed=150.0, lifetime=1.0):
+        """
+        Emit a burst of particles flying out from a point.
+
+        Args:
+            count (int): Number of particles; at most the pool capacity
+            x (float): Horizontal burst origin
+            y (float): Vertical burst origin
+            colors: RGB colors the particles pick from at random
+            speed (float): Largest initial speed in pixels per second
+            lifetime (float): Longest particle life in seconds
+        """
+        count = min(int(count), self.capacity)
+        if count <= 0:
+            return
+
+        # Take the next slots of the ring, overwriting the oldest particles
+        slots = (self._next + np.arange(count)) % self.capacity
+        self._next = (self._next + count) % self.capacity
+
+        angle = self.rng.uniform(0, 2 * np.pi, count)
+        magnitude = self.rng.uniform(0.2, 1.0, count) * speed
+        self.position[slots] = (x, y)
+        self.velocity[slots, 0] = np.cos(angle) * magnitude
+        self.velocity[slots, 1] = np.sin(angle) * magnitude
+        self.lifetime[slots] = self.rng.uniform(0.5, 1.0, count) * lifetime
+        self.life[slots] = self.lifetime[slots]
+        palette = np.asarray(colors, dtype=np.float32)
+        self.color[slots] = palette[self.rng.integers(0, len(palette), count)]
+        self.live = min(self.capacity, self.live + count)
+
+    def clear(self):
+        """Kill every particle."""
+        self.life.fill(0)
+        self.live = 0
+
+    def update(self, dt):
+        """
+        Move and age every particle, culling those that died or left the area.
+
+        Args:
+            dt (float): Seconds since the last update
+        """
+        if not self.live:
+            return
+
+        # Integrate in place through a preallocated scratch array
+        np.multiply(self.velocity, dt, out=self._step)
+        self.position += self._step
+        self.velocity[:, 1] += PARTICLE_GRAVITY * dt
+        self.life -= dt
+
+        x, y = self.position[:, 0], self.position[:, 1]
+        self.life[(x < 0) | (x >= self.width - 1) | (y < 0) | (y >= self.height - 1)] = 0
+        self.live = int(np.count_nonzero(self.life > 0))
+
+    def draw(self, surface):
+        """
+        Draw every live particle as a 2x2 dot fading out with its life.
+
+        Args:
+            surface (pygame.Surface): A 24 or 32 bit surface at least as large
+                as the particle area
+
+        Returns:
+            pygame.Rect: The region the particles cover, or None if none live
+        """
+        if not self.live:
+            return None
+
+        alive = np.flatnonzero(self.life > 0)
+        xs = self.position[alive, 0].astype(np.intp)
+        ys = self.position[alive, 1].astype(np.intp)
+        fade = self.life[alive] / self.lifetime[alive]
+        rgb = (self.color[alive] * fade[:, None]).astype(np.uint32)
+
+        if surface.get_bytesize() == 4:
+            # Write mapped pixel values in a single pass per dot corner
+            red_shift, green_shift, blue_shift, _ = surface.get_shifts()
+            colors = (rgb[:, 0] << red_shift) | (rgb[:, 1] << green_shift) | (rgb[:, 2] << blue_shift)
+            pixels = pygame.surfarray.pixels2d(surface)
+        else:
+            colors = rgb.astype(np.uint8)
+            pixels = pygame.surfarray.pixels3d(surface)
+        for dx, dy in ((0, 0), (1, 0), (0, 1), (1, 1)):
+            pixels[xs + dx, ys + dy] = colors
+
+        # Release the surface lock before anything else blits to it
+        del pixels
+
+        left, top = int(xs.min()), int(ys.min())
+        return pygame.Rect(left, top, int(xs.max()) - left + 2, int(ys.max()) - top + 2)
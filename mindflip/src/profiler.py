@@ -0,0 +1,174 @@
+"""
+Frame profiler for MindFlip: Memory Arcade
+"""
+
+import functools
+import time
+from collections import deque
+from contextlib import contextmanager
+from mindflip.src.config import PROFILER_WINDOW
+
+def percentile(sorted_values, fraction):
+    """
+    Get a percentile of already sorted values.
+
+    Args:
+        sorted_values: Values in ascending order; must not be empty
+        fraction (float): The percentile as a fraction, e.g. 0.95
+
+    Returns:
+        The value below which that fraction of the values falls
+    """
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+class FrameProfiler:
+    """
+    Breaks every frame down into named phases over a rolling window.
+
+    The main loop marks frame boundaries with begin_frame() and end_frame();
+    code in between reports its phases with phase() or the @profiled
+    decorator. Phases may nest, and each one is charged only for the time
+    not spent in the phases inside it, so a font built while the cards are
+    drawn shows up as font creation rather than card drawing.
+
+    Attributes:
+        enabled (bool): Whether frames are being recorded
+        frames (int): Number of frames recorded
+        frame_times (deque): Milliseconds of each recent frame
+        phases (dict): Phase name to a deque of its milliseconds per frame
+    """
+
+    def __init__(self, window=PROFILER_WINDOW):
+        """
+        Initialize a disabled profiler.
+
+        Args:
+            window (int): Number of recent frames statistics cover
+        """
+        self.window = window
+        self.enabled = False
+        self.frames = 0
+        self.frame_times = deque(maxlen=window)
+        self.phases = {}
+        self._frame_start = None
+        self._current = {}
+        self._stack = []
+
+    def begin_frame(self):
+        """Start recording a frame if the profiler is enabled."""
+        self._frame_start = time.perf_counter() if self.enabled else None
+        self._current.clear()
+        self._stack.clear()
+
+    def end_frame(self):
+        """Finish the frame, adding its phase times to the rolling window."""
+        if self._frame_start is None:
+            return
+
+        self.frame_times.append((time.perf_counter() - self._frame_start) * 1000)
+        for name in self._current:
+            if name not in self.phases:
+                self.phases[name] = deque(maxlen=self.window)
+        for name, samples in self.phases.items():
+            samples.append(self._current.get(name, 0.0))
+        self.frames += 1
+        self._frame_start = None
+
+    def start(self, name):
+        """
+        Enter a phase.
+
+        Args:
+            name (str): The phase name
+        """
+        if self._frame_start is not None:
+            self._stack.append([name, time.perf_counter(), 0.0])
+
+    def stop(self):
+        """Leave the phase entered last."""
+        if self._frame_start is None or not self._stack:
+            return
+
+        name, start, nested = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        self._current[name] = self._current.get(name, 0.0) + (elapsed - nested) * 1000
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def add(self, name, milliseconds):
+        """
+        Charge time measured elsewhere to a phase of the current frame.
+
+        The time is taken to have passed just before the frame began, so it
+        counts towards the frame time too.
+
+        Args:
+            name (str): The phase name
+            milliseconds (float): The time to charge
+        """
+        if self._frame_start is None:
+            return
+
+        self._frame_start -= milliseconds / 1000
+        self._current[name] = self._current.get(name, 0.0) + milliseconds
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a block of code as a phase.
+
+        Args:
+            name (str): The phase name
+        """
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def stats(self):
+        """
+        Get rolling percentiles for the whole frame and every phase.
+
+        Returns:
+            list: (name, p50, p95, p99) tuples in milliseconds, the frame
+            first and the phases in the order they first ran
+        """
+        rows = []
+        for name, samples in [('frame', self.frame_times)] + list(self.phases.items()):
+            if samples:
+                ordered = sorted(samples)
+                rows.append((name, percentile(ordered, 0.50), percentile(ordered, 0.95),
+                             percentile(ordered, 0.99)))
+        return rows
+
+    def reset(self):
+        """Drop every recorded frame."""
+        self.frames = 0
+        self.frame_times.clear()
+        self.phases.clear()
+
+def profiled(method):
+    """
+    Decorator timing every call of a function as a phase named after it.
+
+    Args:
+        method: The function to time
+
+    Returns:
+        The wrapped function
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        profiler.start(name)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            profiler.stop()
+
+    return wrapper
+
+# Shared profiler used by the main loop and all drawing code
+profiler = FrameProfiler()
@@ -0,0 +1,180 @@
+"""
+Frame and game tick scheduling for MindFlip: Memory Arcade
+"""
+
+import math
+import time
+import pygame
+from mindflip.src.config import FPS, TICK_RATE, MAX_TICKS_PER_FRAME
+from mindflip.src.clock import clock
+
+class FrameScheduler:
+    """
+    Paces the main loop and lets it sleep when nothing is changing.
+    
+    While something is animating the loop runs at the target frame rate.
+    Otherwise it blocks in pygame.event.wait until input arrives or the
+    next game deadline (e.g. the end of the flip delay) is reached, so an
+    idle game uses next to no CPU.
+    
+    Attributes:
+        fps (int): Target frame rate while animating
+        idle_waits (int): Number of times the loop blocked waiting for input
+        tick_wait (float): Milliseconds the frame rate cap slept before the
+            current frame; idle waits are not counted
+    """
+    
+    def __init__(self, fps=FPS):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            fps (int): Target frame rate while animating
+        """
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+        self.idle_waits = 0
+        self.tick_wait = 0.0
+    
+    def next_events(self, animating, deadline=None):
+        """
+        Wait for the next frame and get the events that arrived meanwhile.
+        
+        Args:
+            animating (bool): Whether anything on screen is animating
+            deadline (float): clock.now() at which the game state next
+                changes on its own, or None if it only changes on input
+                
+        Returns:
+            list: The pygame events to handle this frame
+        """
+        self.tick_wait = 0.0
+        if animating:
+            # Cap the frame rate, timing the sleep for the profiler
+            start = time.perf_counter()
+            self.clock.tick(self.fps)
+            self.tick_wait = (time.perf_counter() - start) * 1000
+            return pygame.event.get()
+        
+        if deadline is None:
+            event = pygame.event.wait()
+        else:
+            timeout = math.ceil((deadline - clock.now()) * 1000) + 1
+            if timeout <= 0:
+                self.clock.tick()
+                return pygame.event.get()
+            event = pygame.event.wait(timeout)
+        
+        self.idle_waits += 1
+        
+        # Restart frame timing so the wait does not count as a slow frame
+        self.clock.tick()
+        
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+        return events
+    
+    def get_fps(self):
+        """Get the measured frame rate."""
+        return self.clock.get_fps()
+
+
+class FixedTimestep:
+    """
+    Splits elapsed time into fixed-length game ticks.
+    
+    Real time accumulates between frames and is paid out in ticks of exactly
+    1 / tick_rate seconds, so game logic advances at the same rate however
+    fast or unevenly frames are rendered. Time left over carries into the
+    next frame. After a stall, at most max_ticks updates run; the time they
+    cannot cover is folded into the last one, as game timers only compare
+    timestamps and lose nothing to a longer tick.
+    
+    Attributes:
+        dt (float): Length of a tick in seconds
+        max_ticks (int): Most ticks run in one frame
+        accumulator (float): Elapsed seconds not yet paid out as ticks
+        ticks (int): Number of ticks of game time paid out so far
+    """
+    
+    # Slack for float error when elapsed time is a whole number of ticks
+    EPSILON = 1e-9
+    
+    def __init__(self, tick_rate=TICK_RATE, max_ticks=MAX_TICKS_PER_FRAME):
+        """
+        Initialize the timestep with no time accumulated.
+        
+        Args:
+            tick_rate (int): Game ticks per second
+            max_ticks (int): Most ticks run in one frame
+        """
+        self.dt = 1 / tick_rate
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.last_time = None
+    
+    def steps(self, now):
+        """
+        Take the time elapsed since the last call and split it into ticks.
+        
+        Args:
+            now (float): The current time in seconds
+            
+        Returns:
+            list: Seconds of game time each update this frame should cover,
+            possibly none
+        """
+        if self.last_time is not None:
+            self.accumulator += max(0.0, now - self.last_time)
+        self.last_time = now
+        
+        count = int((self.accumulator + self.EPSILON) / self.dt)
+        if count == 0:
+            return []
+        self.accumulator = max(0.0, self.accumulator - count * self.dt)
+        self.ticks += count
+        
+        steps = [self.dt] * min(count, self.max_ticks)
+        if count > self.max_ticks:
+            steps[-1] += (count - self.max_ticks) * self.dt
+        return steps
+    
+    def skip(self, now):
+        """
+        Drop the time elapsed since the last call, e.g. while the game is paused.
+        
+        Args:
+            now (float): The current time in seconds
+        """
+        self.last_time = now
+        self.accumulator = 0.0
+    
+    def due_time(self, delay):
+        """
+        Get when the tick that takes game time past a delay will be paid out.
+        
+        Game timers fire on the first tick that takes game time strictly
+        past their deadline, and a tick is only paid out once a whole tick
+        of time has accumulated, so waking any earlier finds nothing to do.
+        
+        Args:
+            delay (float): Game time from the last tick to the deadline
+            
+        Returns:
+            float: The time, on the clock passed to steps(), at which that
+            tick is due
+        """
+        ticks = max(1, math.floor(delay / self.dt + self.EPSILON) + 1)
+        start = self.last_time if self.last_time is not None else clock.now()
+        return start - self.accumulator + ticks * self.dt
+    
+    @property
+    def alpha(self):
+        """
+        Get how far the current frame is between the last tick and the next.
+        
+        Returns:
+            float: Fraction from 0 to 1 for interpolating rendered positions
+        """
+        return min(1.0, self.accumulator / self.dt)
@@ -0,0 +1,104 @@
+"""
+Retained scene sprites for MindFlip: Memory Arcade
+"""
+
+import pygame
+
+# Scene layers, bottom to top
+LAYER_CHROME = 0
+LAYER_CARDS = 1
+LAYER_CURSOR = 2
+LAYER_HUD = 3
+LAYER_TOOLTIPS = 4
+LAYER_TOASTS = 5
+LAYER_OVERLAY = 6
+LAYER_DEBUG = 7
+
+# Content marker for sprites that have to be rendered again
+_STALE = object()
+
+class SceneGroup(pygame.sprite.LayeredDirty):
+    """
+    A LayeredDirty group that merges overlapping repaint regions.
+
+    LayeredDirty blits an unchanged sprite once for every pending region it
+    touches, so a translucent sprite under two overlapping regions, say a
+    full repaint and the spot a removed sprite left, would be blended twice.
+    """
+
+    def draw(self, surface, bgsurf=None, special_flags=None):
+        """Merge the pending repaint regions, then draw as LayeredDirty does."""
+        pending = []
+        for rect in self.lostsprites:
+            rect = pygame.Rect(rect)
+            i = rect.collidelist(pending)
+            while i > -1:
+                rect.union_ip(pending.pop(i))
+                i = rect.collidelist(pending)
+            pending.append(rect)
+        self.lostsprites[:] = pending
+        return super().draw(surface, bgsurf, special_flags)
+
+    def invalidate(self):
+        """Make every sprite render its image again on its next show()."""
+        for sprite in self.sprites():
+            sprite.invalidate()
+
+class ContentSprite(pygame.sprite.DirtySprite):
+    """
+    A scene sprite whose image is re-rendered only when its content changes.
+
+    Drawing code calls show() every frame with a small hashable description
+    of what the sprite displays. The image is rendered, and the sprite
+    marked dirty for pygame.sprite.LayeredDirty, only when that description
+    differs from the previous one.
+
+    Attributes:
+        content: Description of what the current image shows
+    """
+
+    def __init__(self, layer):
+        """
+        Create a hidden sprite.
+
+        Args:
+            layer (int): Scene layer the sprite is drawn on
+        """
+        self._layer = layer
+        super().__init__()
+        self.image = pygame.Surface((0, 0))
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.content = _STALE
+        self.visible = 0
+
+    def show(self, content, render):
+        """
+        Show the sprite, re-rendering it if its content changed.
+
+        Args:
+            content: Hashable description of what the sprite displays
+            render: Callable returning (image, rect), called only on change
+        """
+        if content != self.content:
+            self.image, self.rect = render()
+            self.content = content
+            self.dirty = 1
+        if not self.visible:
+            self.visible = 1
+
+    def hide(self, release=False):
+        """
+        Hide the sprite; LayeredDirty erases it on the next draw.
+
+        Args:
+            release (bool): Also drop the image so its memory is freed
+        """
+        if self.visible:
+            self.visible = 0
+        if release:
+            self.image = pygame.Surface((0, 0))
+            self.content = _STALE
+
+    def invalidate(self):
+        """Force the image to be rendered again on the next show()."""
+        self.content = _STALE
@@ -0,0 +1,92 @@
+"""
+Animated starfield background for MindFlip: Memory Arcade
+"""
+
+import numpy as np
+import pygame
+
+# Pixel offsets used to stamp small, medium and large stars
+STAR_SHAPES = (
+    np.array([(0, 0)]),
+    np.array([(0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)]),
+    np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)])
+)
+
+class Starfield:
+    """
+    A field of twinkling stars drifting slowly to the right.
+    
+    Star positions, sizes and speeds live in NumPy arrays so brightness,
+    movement and wrap-around are computed for every star in one step and
+    the pixels are written straight into the target surface through
+    pygame.surfarray.
+    
+    Attributes:
+        x (numpy.ndarray): Horizontal star positions
+        y (numpy.ndarray): Vertical star positions
+        size (numpy.ndarray): Star radii
+        speed (numpy.ndarray): Drift and twinkle speeds
+    """
+    
+    def __init__(self, count, width, height, seed=None):
+        """
+        Create a random starfield.
+        
+        Args:
+            count (int): Number of stars
+            width (int): Field width in pixels
+            height (int): Field height in pixels
+            seed: Optional random seed
+        """
+        rng = np.random.default_rng(seed)
+        self.width = width
+        self.height = height
+        self.x = rng.uniform(0, width, count)
+        self.y = rng.integers(0, height, count)
+        self.size = rng.uniform(0.5, 2.0, count)
+        self.speed = rng.uniform(0.2, 1.0, count)
+        
+        # Expand every star into the pixels it covers once; the shape of a
+        # star and its row never change, only its column drifts
+        shape_index = np.digitize(self.size, (1.0, 1.5))
+        stars, dx, ys = [], [], []
+        for i, shape in enumerate(STAR_SHAPES):
+            indices = np.flatnonzero(shape_index == i)
+            stars.append(np.repeat(indices, len(shape)))
+            dx.append(np.tile(shape[:, 0], len(indices)))
+            ys.append((self.y[indices, None] + shape[:, 1]).ravel())
+        self.pixel_star = np.concatenate(stars)
+        self.pixel_dx = np.concatenate(dx)
+        self.pixel_y = np.clip(np.concatenate(ys), 0, height - 1)
+    
+    def __len__(self):
+        return len(self.x)
+    
+    def draw(self, surface, animation_time):
+        """
+        Draw every star onto a 24 or 32 bit surface.
+        
+        Args:
+            surface (pygame.Surface): The surface to draw on
+            animation_time (float): Current animation time, drives twinkling
+        """
+        brightness = (128 + 127 * np.sin(animation_time * self.speed)).astype(np.uint32)
+        xs = (self.x.astype(np.intp)[self.pixel_star] + self.pixel_dx) % self.width
+        
+        if surface.get_bytesize() == 4:
+            # Write mapped grey pixel values in a single pass
+            red_shift, green_shift, blue_shift, _ = surface.get_shifts()
+            colors = (brightness << red_shift) | (brightness << green_shift) | (brightness << blue_shift)
+            pixels = pygame.surfarray.pixels2d(surface)
+            pixels[xs, self.pixel_y] = colors[self.pixel_star]
+        else:
+            pixels = pygame.surfarray.pixels3d(surface)
+            pixels[xs, self.pixel_y] = brightness.astype(np.uint8)[self.pixel_star, None]
+        
+        # Release the surface lock before anything else blits to it
+        del pixels
+    
+    def advance(self):
+        """Move every star one frame to the right, wrapping at the edge."""
+        self.x += self.speed * 0.2
+        self.x[self.x > self.width] = 0
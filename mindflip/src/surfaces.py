@@ -0,0 +1,23 @@
+"""
+Surface helpers for MindFlip: Memory Arcade
+"""
+
+import pygame
+
+def prepare_surface(surface, alpha=False):
+    """
+    Convert a surface to the display pixel format so blits need no conversion.
+    
+    Conversion needs an active display mode; without one (e.g. before the
+    window is opened) the surface is returned unchanged.
+    
+    Args:
+        surface (pygame.Surface): The surface to convert
+        alpha (bool): Whether to keep per-pixel alpha
+        
+    Returns:
+        pygame.Surface: The converted surface
+    """
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
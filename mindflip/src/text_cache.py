@@ -0,0 +1,99 @@
+"""
+Rendered text cache for MindFlip: Memory Arcade
+"""
+
+from collections import OrderedDict
+from mindflip.src.config import TEXT_CACHE_SIZE
+from mindflip.src.surfaces import prepare_surface
+
+class TextCache:
+    """
+    Bounded LRU cache of rendered text surfaces.
+    
+    Entries are keyed by (font id, text, color, antialias). Fonts come from
+    the shared FontRegistry and live for the whole program, so their ids are
+    stable. Surfaces are converted to the display format when rendered and
+    the least recently used one is evicted when the cache is full.
+    
+    Attributes:
+        capacity (int): Maximum number of cached surfaces
+        hits (int): Number of renders served from the cache
+        misses (int): Number of renders that had to rasterize text
+        evictions (int): Number of surfaces dropped to stay within capacity
+    """
+    
+    def __init__(self, capacity=TEXT_CACHE_SIZE):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            capacity (int): Maximum number of cached surfaces
+        """
+        self.capacity = capacity
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def render(self, font, text, antialias, color):
+        """
+        Render text, reusing the surface from an earlier identical call.
+        
+        Takes the same arguments as pygame.font.Font.render, with the font first.
+        
+        Args:
+            font (pygame.font.Font): The font to render with
+            text (str): The text to render
+            antialias (bool): Whether to antialias the text
+            color: The text color
+            
+        Returns:
+            pygame.Surface: The rendered text (shared; do not draw on it)
+        """
+        key = (id(font), text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+        
+        self.misses += 1
+        surface = prepare_surface(font.render(text, antialias, color), alpha=True)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.capacity:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+    
+    def clear(self):
+        """Drop every cached surface."""
+        self._surfaces.clear()
+    
+    def reset_stats(self):
+        """Reset the hit, miss and eviction counters."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def stats(self):
+        """
+        Get cache statistics.
+        
+        Returns:
+            dict: Size, capacity, hits, misses, evictions and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._surfaces),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+    
+    def __len__(self):
+        return len(self._surfaces)
+
+# Shared cache used by all UI code
+text_cache = TextCache()
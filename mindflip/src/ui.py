@@ -3,17 +3,36 @@ UI rendering for MindFlip: Memory Arcade
 """
 
 import pygame
-import time
-import math
-import random
+from collections import deque
 from mindflip.src.config import (
     WINDOW_WIDTH, WINDOW_HEIGHT, 
-    CARD_WIDTH, CARD_HEIGHT, CARD_MARGIN,
-    CARD_BACK_COLOR, CARD_FRONT_COLOR, CARD_HIGHLIGHT_COLOR, CARD_MATCHED_COLOR,
+    CARD_HIGHLIGHT_COLOR, CARD_MATCHED_COLOR,
     BACKGROUND_COLOR, TEXT_COLOR, TITLE_COLOR, SCORE_COLOR, LIVES_COLOR,
     BUTTON_COLOR, BUTTON_HOVER_COLOR, BUTTON_TEXT_COLOR, ICON_COLOR, ICON_HOVER_COLOR,
-    DEBUG_MODE, LEVEL_BONUS, ANIMATE_BACKGROUND, BACKGROUND_ANIMATION_SPEED,
-    GAME_RULES, POINTS_SYSTEM
+    DEBUG_MODE, LEVEL_BONUS, ANIMATE_BACKGROUND, BACKGROUND_ANIMATION_SPEED, STAR_COUNT,
+    GAME_RULES, POINTS_SYSTEM,
+    TEXT_SIZE_SMALL, TEXT_SIZE_MEDIUM, TEXT_SIZE_LARGE,
+    DIRTY_RECT_RENDERING, TOAST_QUEUE_SIZE,
+    FPS, PARTICLE_CAPACITY, MATCH_PARTICLES, PARTICLE_LIFETIME, STRESS_EMIT_STEP,
+    PROFILER_REFRESH, SCORE_ROLL_TIME, MARATHON_ZOOM_LEVELS
+)
+from mindflip.src.fonts import fonts, FontSet
+from mindflip.src.clock import clock
+from mindflip.src.text_cache import text_cache
+from mindflip.src.glyphs import glyphs
+from mindflip.src.card_sprites import CardSpriteCache, card_state
+from mindflip.src.card_faces import card_faces
+from mindflip.src.card_animation import CardAnimator
+from mindflip.src.surfaces import prepare_surface
+from mindflip.src.starfield import Starfield
+from mindflip.src.particles import ParticleSystem
+from mindflip.src.profiler import profiler, profiled
+from mindflip.src.game import Game
+from mindflip.src.layout import CardLayout
+from mindflip.src.sprites import (
+    SceneGroup, ContentSprite,
+    LAYER_CHROME, LAYER_CARDS, LAYER_CURSOR, LAYER_HUD,
+    LAYER_TOOLTIPS, LAYER_TOASTS, LAYER_OVERLAY, LAYER_DEBUG
 )
 
 class Button:
@@ -26,16 +45,34 @@ class Button:
         self.action = action
         self.hovered = False
     
-    def draw(self, surface):
-        """Draw the button on the given surface."""
+    def draw(self, surface, rect=None):
+        """
+        Draw the button on the given surface.
+        
+        Args:
+            surface: The surface to draw on
+            rect: Where to draw the button; defaults to its screen position
+        """
+        rect = rect or self.rect
         color = BUTTON_HOVER_COLOR if self.hovered else BUTTON_COLOR
-        pygame.draw.rect(surface, color, self.rect)
-        pygame.draw.rect(surface, TEXT_COLOR, self.rect, 2)  # Border
+        pygame.draw.rect(surface, color, rect)
+        pygame.draw.rect(surface, TEXT_COLOR, rect, 2)  # Border
         
-        text_surf = self.font.render(self.text, True, BUTTON_TEXT_COLOR)
-        text_rect = text_surf.get_rect(center=self.rect.center)
+        text_surf = text_cache.render(self.font, self.text, True, BUTTON_TEXT_COLOR)
+        text_rect = text_surf.get_rect(center=rect.center)
         surface.blit(text_surf, text_rect)
     
+    def render(self):
+        """
+        Render the button into its own surface.
+        
+        Returns:
+            pygame.Surface: The button image, the size of its rect
+        """
+        image = pygame.Surface(self.rect.size)
+        self.draw(image, image.get_rect())
+        return prepare_surface(image)
+    
     def check_hover(self, pos):
         """Check if mouse position is over the button."""
         self.hovered = self.rect.collidepoint(pos)
@@ -59,34 +96,97 @@ class Icon:
         self.font = font
         self.tooltip_lines = tooltip_lines
         self.hovered = False
+        self.tooltip_surface = None
     
-    def draw(self, surface):
-        """Draw the icon on the given surface."""
+    def set_font(self, font):
+        """
+        Change the icon font, dropping the tooltip rendered with the old one.
+        
+        Args:
+            font: The new font
+        """
+        if font is not self.font:
+            self.font = font
+            self.tooltip_surface = None
+    
+    def draw(self, surface, center=None):
+        """
+        Draw the icon on the given surface.
+        
+        Args:
+            surface: The surface to draw on
+            center: Where to centre the icon; defaults to its screen position
+        """
+        center = center or (self.x, self.y)
         color = ICON_HOVER_COLOR if self.hovered else ICON_COLOR
         
         # Draw circle
-        pygame.draw.circle(surface, color, (self.x, self.y), self.radius)
-        pygame.draw.circle(surface, TEXT_COLOR, (self.x, self.y), self.radius, 2)  # Border
+        pygame.draw.circle(surface, color, center, self.radius)
+        pygame.draw.circle(surface, TEXT_COLOR, center, self.radius, 2)  # Border
         
         # Draw symbol
-        symbol_surf = self.font.render(self.symbol, True, TEXT_COLOR)
-        symbol_rect = symbol_surf.get_rect(center=(self.x, self.y))
+        symbol_surf = text_cache.render(self.font, self.symbol, True, TEXT_COLOR)
+        symbol_rect = symbol_surf.get_rect(center=center)
         surface.blit(symbol_surf, symbol_rect)
     
+    def render(self):
+        """
+        Render the icon into its own transparent surface.
+        
+        Returns:
+            pygame.Surface: The icon image, the size of get_rect()
+        """
+        size = self.radius * 2 + 1
+        image = pygame.Surface((size, size), pygame.SRCALPHA)
+        self.draw(image, (self.radius, self.radius))
+        return prepare_surface(image, alpha=True)
+    
+    def get_rect(self):
+        """Get the bounding rect of the icon."""
+        return pygame.Rect(self.x - self.radius, self.y - self.radius,
+                           self.radius * 2 + 1, self.radius * 2 + 1)
+    
     def draw_tooltip(self, surface):
-        """Draw the tooltip if icon is hovered."""
+        """
+        Draw the tooltip if icon is hovered.
+        
+        Returns:
+            pygame.Rect: The region covered by the tooltip, or None if hidden
+        """
         if not self.hovered:
-            return
-            
-        # Calculate tooltip dimensions
-        line_height = 22
-        padding = 10
-        width = 300
-        height = len(self.tooltip_lines) * line_height + padding * 2
+            return None
+        
+        tooltip_surface, tooltip_rect = self.get_tooltip()
+        return surface.blit(tooltip_surface, tooltip_rect)
+    
+    def get_tooltip(self):
+        """
+        Get the tooltip image and where it goes, rendering it on first use.
+        
+        Returns:
+            tuple: (pygame.Surface, pygame.Rect) of the tooltip
+        """
+        if self.tooltip_surface is None:
+            self.tooltip_surface = self.render_tooltip()
         
         # Position tooltip to not go off screen
+        width, height = self.tooltip_surface.get_size()
         x = min(self.x + 10, WINDOW_WIDTH - width - 10)
         y = min(self.y + 10, WINDOW_HEIGHT - height - 10)
+        return self.tooltip_surface, pygame.Rect(x, y, width, height)
+    
+    def render_tooltip(self):
+        """
+        Render the tooltip once; it only changes when the font does.
+        
+        Returns:
+            pygame.Surface: The finished tooltip
+        """
+        # Calculate tooltip dimensions
+        line_height = max(22, self.font.get_linesize())
+        padding = 10
+        width = max([300] + [self.font.size(line)[0] + padding * 2 for line in self.tooltip_lines])
+        height = len(self.tooltip_lines) * line_height + padding * 2
         
         # Draw tooltip background
         tooltip_surface = pygame.Surface((width, height), pygame.SRCALPHA)
@@ -95,12 +195,11 @@ class Icon:
         
         # Draw tooltip text
         for i, line in enumerate(self.tooltip_lines):
-            text_surf = self.font.render(line, True, TEXT_COLOR)
+            text_surf = text_cache.render(self.font, line, True, TEXT_COLOR)
             text_rect = text_surf.get_rect(x=padding, y=padding + i * line_height)
             tooltip_surface.blit(text_surf, text_rect)
         
-        # Draw tooltip
-        surface.blit(tooltip_surface, (x, y))
+        return prepare_surface(tooltip_surface, alpha=True)
     
     def check_hover(self, pos):
         """Check if mouse position is over the icon."""
@@ -109,43 +208,154 @@ class Icon:
         self.hovered = (dx*dx + dy*dy) <= (self.radius * self.radius)
         return self.hovered
 
+class Toast:
+    """A toast message rendered once and faded out with surface alpha."""
+    
+    def __init__(self, message, font, duration):
+        """
+        Render a new toast.
+        
+        Args:
+            message (str): The message to display
+            font: The font to render the message with
+            duration (float): Seconds the toast stays on screen
+        """
+        self.message = message
+        self.duration = duration
+        self.start_time = clock.now()
+        
+        # Render the toast body: translucent background with the text centred
+        toast_text = text_cache.render(font, message, True, (255, 255, 255))
+        width = max(400, toast_text.get_width() + 20)
+        body = pygame.Surface((width, 40), pygame.SRCALPHA)
+        body.fill((0, 0, 0, 180))
+        body.blit(toast_text, toast_text.get_rect(center=(width // 2, 20)))
+        self.surface = prepare_surface(body, alpha=True)
+    
+    def alpha(self, current_time):
+        """
+        Get the toast opacity; it fades out over the second half of its life.
+        
+        Args:
+            current_time (float): The current time in seconds
+            
+        Returns:
+            int: Alpha value from 0 to 255
+        """
+        time_left = self.duration - (current_time - self.start_time)
+        return max(0, min(255, int(time_left * 255 / (self.duration / 2))))
+    
+    def expired(self, current_time):
+        """Check whether the toast has finished showing."""
+        return current_time - self.start_time >= self.duration
+
+class RollingCounter:
+    """A number shown counting up to its new value instead of jumping to it."""
+    
+    def __init__(self, duration=SCORE_ROLL_TIME):
+        """
+        Start the counter at 0.
+        
+        Args:
+            duration (float): Seconds a roll to a new value takes
+        """
+        self.duration = duration
+        self.value = 0
+        self.target = 0
+        self.start_value = 0
+        self.start_time = 0.0
+    
+    def update(self, target, current_time):
+        """
+        Get the value to show now.
+        
+        Args:
+            target (int): The real value
+            current_time (float): The current time in seconds
+            
+        Returns:
+            int: The value to show, easing out towards the target
+        """
+        if target != self.target:
+            # Roll on from the value shown; a drop (e.g. a reset) shows at once
+            self.start_value = self.value if target > self.value else target
+            self.target = target
+            self.start_time = current_time
+        
+        progress = min(1.0, (current_time - self.start_time) / self.duration) if self.duration > 0 else 1.0
+        eased = 1 - (1 - progress) ** 3
+        self.value = self.start_value + round((self.target - self.start_value) * eased)
+        return self.value
+    
+    def is_rolling(self):
+        """Check whether the counter is still on its way to the target."""
+        return self.value != self.target
+
 class UI:
     """
     Handles all rendering and UI elements for the game.
+    
+    Every element on screen is a ContentSprite held in a
+    pygame.sprite.LayeredDirty group, one for the game screen and one for the
+    splash screen. The draw_* methods only tell each sprite what it should
+    show; the group then redraws the sprites whose content changed and erases
+    what they leave behind from the background surface.
     """
     
-    def __init__(self):
-        """Initialize the UI system."""
-        pygame.font.init()
-        self.title_font = pygame.font.SysFont('Arial', 36, bold=True)
-        self.hud_font = pygame.font.SysFont('Arial', 24)
-        self.card_font = pygame.font.SysFont('Arial', 32, bold=True)
-        self.debug_font = pygame.font.SysFont('Arial', 16, bold=True)
-        self.message_font = pygame.font.SysFont('Arial', 48, bold=True)
-        self.state_font = pygame.font.SysFont('Arial', 18)
-        self.icon_font = pygame.font.SysFont('Arial', 18, bold=True)
+    def __init__(self, seed=None):
+        """
+        Initialize the UI system.
         
-        # Create the main surface
-        self.surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        Args:
+            seed: Optional random seed for the starfield and particle effects
+        """
+        pygame.font.init()
+        self.fonts = fonts
+        self.text_cache = text_cache
+        self.glyphs = glyphs
+        self.prewarm_fonts()
+        
+        # Fonts for every text size, so changing it never builds a font
+        self.font_sets = {
+            text_size: FontSet(self.fonts, text_size)
+            for text_size in (TEXT_SIZE_SMALL, TEXT_SIZE_MEDIUM, TEXT_SIZE_LARGE)
+        }
+        self.font_set = self.font_sets[TEXT_SIZE_MEDIUM]
+        self.profiler_font = self.fonts.get('Arial', 12)
+        
+        # Pre-rendered card sprites and the flip/match animations built from them
+        self.card_sprites = CardSpriteCache(self.fonts, card_faces)
+        self.card_animator = CardAnimator(self.card_sprites)
+        
+        # Background the scene is drawn over and erased back to
+        self.background = prepare_surface(pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)))
+        self.background.fill(BACKGROUND_COLOR)
+        self.background_static = True
+        self.background_changed = True
+        
+        # Dirty-rectangle rendering: only changed regions reach the display
+        self.dirty_rendering = DIRTY_RECT_RENDERING
+        self.dirty_rects = []
         
         # Animation variables
         self.match_flash_time = 0
         self.show_match_flash = False
         self.animation_time = 0
-        self.stars = []
+        self.score_counter = RollingCounter()
         
         # Initialize stars for background animation
-        self.stars = []
-        for _ in range(100):
-            x = random.randint(0, WINDOW_WIDTH)
-            y = random.randint(0, WINDOW_HEIGHT)
-            size = random.uniform(0.5, 2.0)
-            speed = random.uniform(0.2, 1.0)
-            self.stars.append((x, y, size, speed))
+        self.stars = Starfield(STAR_COUNT, WINDOW_WIDTH, WINDOW_HEIGHT, seed)
+        
+        # Particle effects, drawn on top of the finished scene
+        self.particles = ParticleSystem(PARTICLE_CAPACITY, WINDOW_WIDTH, WINDOW_HEIGHT, seed)
+        self.particle_rect = None
+        self.particle_time = clock.now()
+        self.particle_stress = False
+        self.stress_rate = 0
+        self.frame_clock = pygame.time.Clock()
         
         # Toast message system
-        self.toast_message = None
-        self.toast_time = 0
+        self.toasts = deque(maxlen=TOAST_QUEUE_SIZE)
         self.toast_duration = 2.0  # seconds
         
         # Create buttons for splash screen
@@ -191,43 +401,173 @@ class UI:
             self.icon_font,
             POINTS_SYSTEM
         )
+        
+        self.build_scene()
+    
+    def build_scene(self):
+        """Create the sprites of the game and splash screens."""
+        self.game_sprites = SceneGroup()
+        self.splash_sprites = SceneGroup()
+        self.active_sprites = None
+        
+        # Buttons, info icons and tooltips
+        self.button_sprites = {
+            button: ContentSprite(LAYER_CHROME)
+            for button in [self.back_button, self.debug_button] + self.text_size_buttons
+        }
+        self.icon_sprites = {}
+        self.tooltip_sprites = {}
+        for icon in (self.rules_icon, self.points_icon):
+            self.icon_sprites[icon] = ContentSprite(LAYER_CHROME)
+            self.tooltip_sprites[icon] = ContentSprite(LAYER_TOOLTIPS)
+        
+        # Game screen
+        self.title_sprite = ContentSprite(LAYER_CHROME)
+        self.controls_sprite = ContentSprite(LAYER_CHROME)
+        self.debug_label_sprite = ContentSprite(LAYER_HUD)
+        self.level_sprite = ContentSprite(LAYER_HUD)
+        self.score_sprite = ContentSprite(LAYER_HUD)
+        self.lives_sprite = ContentSprite(LAYER_HUD)
+        self.game_state_sprite = ContentSprite(LAYER_HUD)
+        self.combo_sprite = ContentSprite(LAYER_HUD)
+        self.stress_sprite = ContentSprite(LAYER_HUD)
+        self.cursor_sprite = ContentSprite(LAYER_CURSOR)
+        self.toast_sprites = [ContentSprite(LAYER_TOASTS) for _ in range(TOAST_QUEUE_SIZE)]
+        self.overlay_sprite = ContentSprite(LAYER_OVERLAY)
+        self.profiler_sprite = ContentSprite(LAYER_DEBUG)
+        self.game_sprites.add(
+            self.title_sprite, self.controls_sprite, self.debug_label_sprite,
+            self.level_sprite, self.score_sprite, self.lives_sprite,
+            self.game_state_sprite, self.combo_sprite, self.stress_sprite, self.cursor_sprite,
+            self.toast_sprites, self.overlay_sprite, self.profiler_sprite,
+            self.button_sprites[self.back_button],
+            [self.button_sprites[button] for button in self.text_size_buttons],
+            list(self.icon_sprites.values()), list(self.tooltip_sprites.values())
+        )
+        
+        # Card sprites, rebuilt whenever the game deals a new grid
+        self.card_views = []
+        self.scene_cards = None
+        self.scene_layout = None
+        
+        # Splash screen
+        self.splash_title_sprite = ContentSprite(LAYER_CHROME)
+        self.splash_description_sprite = ContentSprite(LAYER_CHROME)
+        self.splash_start_sprite = ContentSprite(LAYER_CHROME)
+        self.splash_controls_sprite = ContentSprite(LAYER_CHROME)
+        self.splash_sprites.add(
+            self.splash_title_sprite, self.splash_description_sprite,
+            self.splash_start_sprite, self.splash_controls_sprite,
+            self.button_sprites[self.debug_button], self.toast_sprites,
+            list(self.icon_sprites.values()), list(self.tooltip_sprites.values())
+        )
+    
+    @property
+    def title_font(self):
+        """Font for titles at the current text size."""
+        return self.font_set.title
+    
+    @property
+    def hud_font(self):
+        """Font for the HUD and toasts at the current text size."""
+        return self.font_set.hud
+    
+    @property
+    def card_font(self):
+        """Font for card values at the current text size."""
+        return self.font_set.card
+    
+    @property
+    def debug_font(self):
+        """Font for buttons and debug text at the current text size."""
+        return self.font_set.debug
+    
+    @property
+    def message_font(self):
+        """Font for full-screen messages at the current text size."""
+        return self.font_set.message
+    
+    @property
+    def state_font(self):
+        """Font for game state and control hints at the current text size."""
+        return self.font_set.state
+    
+    @property
+    def icon_font(self):
+        """Font for the info icons at the current text size."""
+        return self.font_set.icon
+    
+    def prewarm_fonts(self):
+        """
+        Build the card fonts up front.
+        
+        Covers the scaled card fonts for every grid the level progression can
+        produce and every marathon zoom level, so the per-frame drawing code
+        never constructs a font. The text fonts are built with the font sets.
+        """
+        layouts = [CardLayout(rows, cols) for rows, cols in Game.possible_grid_sizes()]
+        layouts.extend(CardLayout(2, 2, zoom=zoom) for zoom in MARATHON_ZOOM_LEVELS)
+        card_sizes = []
+        for layout in layouts:
+            font_scale = layout.font_scale
+            card_sizes.extend((int(32 * font_scale), int(16 * font_scale)))
+        self.fonts.prewarm('Arial', card_sizes, bold=True)
     
     def update_fonts(self, text_size):
-        """Update font sizes based on text size setting."""
-        self.title_font = pygame.font.SysFont('Arial', int(36 * text_size), bold=True)
-        self.hud_font = pygame.font.SysFont('Arial', int(24 * text_size), bold=True)
-        self.card_font = pygame.font.SysFont('Arial', int(32 * text_size), bold=True)
-        self.debug_font = pygame.font.SysFont('Arial', int(16 * text_size), bold=True)
-        self.message_font = pygame.font.SysFont('Arial', int(48 * text_size), bold=True)
-        self.state_font = pygame.font.SysFont('Arial', int(18 * text_size), bold=True)
-        self.icon_font = pygame.font.SysFont('Arial', int(18 * text_size), bold=True)
+        """
+        Switch to the prebuilt fonts of a text size setting.
+        
+        Args:
+            text_size (float): TEXT_SIZE_SMALL, TEXT_SIZE_MEDIUM or TEXT_SIZE_LARGE
+        """
+        font_set = self.font_sets[text_size]
+        if font_set is self.font_set:
+            return
+        self.font_set = font_set
+        self.rules_icon.set_font(self.icon_font)
+        self.points_icon.set_font(self.icon_font)
+        
+        # Every sprite may show text; render them all again and repaint the
+        # screen once rather than every old and new sprite region
+        self.game_sprites.invalidate()
+        self.splash_sprites.invalidate()
+        self.background_changed = True
     
+    @profiled
     def draw_animated_background(self):
         """Draw an animated starfield background."""
         if not ANIMATE_BACKGROUND:
-            self.surface.fill(BACKGROUND_COLOR)
+            # A static background only has to be painted once
+            if not self.background_static:
+                self.background.fill(BACKGROUND_COLOR)
+                self.background_static = True
+                self.background_changed = True
             return
-            
+        
         # Fill with dark background
-        self.surface.fill((20, 20, 40))
+        self.background.fill((20, 20, 40))
         
         # Update animation time
         self.animation_time += 0.01 * BACKGROUND_ANIMATION_SPEED
         
-        # Draw stars
-        for i, (x, y, size, speed) in enumerate(self.stars):
-            # Calculate star brightness based on time
-            brightness = 128 + int(127 * math.sin(self.animation_time * speed))
-            color = (brightness, brightness, brightness)
-            
-            # Draw star
-            pygame.draw.circle(self.surface, color, (int(x), int(y)), size)
-            
-            # Move star slightly for animation
-            new_x = x + speed * 0.2
-            if new_x > WINDOW_WIDTH:
-                new_x = 0
-            self.stars[i] = (new_x, y, size, speed)
+        # Draw stars, then move them slightly for animation
+        self.stars.draw(self.background, self.animation_time)
+        self.stars.advance()
+        
+        # The whole scene sits on the background, so all of it is redrawn
+        self.background_static = False
+        self.background_changed = True
+    
+    def is_animating(self):
+        """
+        Check whether the screen changes from frame to frame without input.
+        
+        Returns:
+            bool: True while the starfield runs, a toast is fading, a card
+            is turning over, particles are flying or the score is rolling
+        """
+        return (ANIMATE_BACKGROUND or bool(self.toasts) or self.card_animator.is_animating()
+                or self.particles.live > 0 or self.particle_stress or self.score_counter.is_rolling())
     
     def draw_game(self, game, screen):
         """
@@ -237,22 +577,17 @@ class UI:
             game: The game state object
             screen: The pygame screen to draw on
         """
+        # Measure the frame rate for the particle stress test readout
+        self.frame_clock.tick()
+        
         # Draw animated background
         self.draw_animated_background()
         
-        # Draw title
-        self.draw_title(game)
-        
-        # Draw back button
-        self.back_button.draw(self.surface)
+        # Draw title, buttons, info icons and controls
+        self.draw_chrome()
         
-        # Draw info icons
-        self.rules_icon.draw(self.surface)
-        self.points_icon.draw(self.surface)
-        
-        # Draw tooltips if hovered
-        self.rules_icon.draw_tooltip(self.surface)
-        self.points_icon.draw_tooltip(self.surface)
+        # Draw debug mode indicator if enabled
+        self.draw_debug_label(game)
         
         # Draw HUD (score, level, tries)
         self.draw_hud(game)
@@ -266,173 +601,489 @@ class UI:
         # Draw combo indicator
         self.draw_combo(game)
         
-        # Draw controls info
-        self.draw_controls()
-        
-        # Draw text size buttons
-        for button in self.text_size_buttons:
-            button.draw(self.surface)
-        
-        # Draw toast message if active
+        # Draw toast messages if active
         self.draw_toast()
         
-        # Draw level transition screen if in that state
-        if game.game_state == game.STATE_LEVEL_COMPLETE:
-            self.draw_level_transition(game)
+        # Draw the particle stress test readout
+        self.draw_particle_stats(game)
         
-        # Draw game over if needed
+        # Draw game over or level transition screen if in that state
         if game.game_over:
             self.draw_game_over(game)
+        elif game.game_state == game.STATE_LEVEL_COMPLETE:
+            self.draw_level_transition(game)
+        else:
+            self.overlay_sprite.hide(release=True)
+        
+        # Draw the frame profiler in debug mode
+        self.draw_profiler(game)
+        
+        # Move the particles and erase them where they were last frame
+        self.update_particles()
+        
+        # Finish the frame
+        self.present(screen, self.game_sprites)
+        
+        # Draw particles on top of the finished scene
+        self.draw_particles(screen)
+    
+    @profiled
+    def present(self, screen, sprites):
+        """
+        Draw the sprites that changed and work out what the display must show.
+        
+        The whole screen is repainted when the background changed, when a
+        different screen was shown last frame, or when dirty-rectangle
+        rendering is off. Afterwards self.dirty_rects holds the regions for
+        pygame.display.update(); outside dirty-rectangle mode it holds the
+        whole screen.
+        
+        Args:
+            screen: The pygame screen to draw on
+            sprites: The LayeredDirty group of the screen being shown
+        """
+        screen_rect = screen.get_rect()
+        if self.background_changed or sprites is not self.active_sprites or not self.dirty_rendering:
+            sprites.repaint_rect(screen_rect)
+            self.background_changed = False
+            self.active_sprites = sprites
+        
+        dirty_rects = sprites.draw(screen, self.background)
+        self.dirty_rects = dirty_rects if self.dirty_rendering else [screen_rect]
+    
+    def burst_match(self, game):
+        """
+        Burst particles out of the pair of cards that was just matched.
+        
+        The burst grows with the combo count.
+        
+        Args:
+            game: The game state object
+        """
+        count = MATCH_PARTICLES * max(1, game.combo_count)
+        for card in (game.first_card, game.second_card):
+            x, y = game.layout.card_rect(card.row, card.col).center
+            self.particles.emit(count, x, y, (CARD_MATCHED_COLOR, SCORE_COLOR, TITLE_COLOR),
+                                lifetime=PARTICLE_LIFETIME)
+    
+    def leave_game(self):
+        """
+        Stop everything the game screen animates, when returning to the menu.
+        
+        Card animations, particles, the stress test and the score roll are
+        only advanced while the game screen is drawn, so left running they
+        would keep the splash screen from ever idling.
+        """
+        self.card_animator.reset()
+        self.scene_cards = None
+        self.particles.clear()
+        self.particle_rect = None
+        self.particle_stress = False
+        self.stress_rate = 0
+        self.score_counter = RollingCounter()
+    
+    def toggle_particle_stress(self):
+        """
+        Toggle the particle stress test.
+        
+        While it runs, a fountain in the middle of the screen emits more
+        particles every frame for as long as the frame rate holds, and backs
+        off when it drops, so the live count settles at what the renderer
+        sustains.
+        
+        Returns:
+            bool: True if the stress test is now running
+        """
+        self.particle_stress = not self.particle_stress
+        self.stress_rate = 0
+        return self.particle_stress
+    
+    @profiled
+    def update_particles(self):
+        """Emit stress test particles, move every particle and schedule the erase."""
+        current_time = clock.now()
+        dt = min(current_time - self.particle_time, 0.1)
+        self.particle_time = current_time
+        
+        if self.particle_stress:
+            if self.frame_clock.get_fps() >= FPS * 0.95:
+                self.stress_rate += STRESS_EMIT_STEP
+            else:
+                self.stress_rate = max(STRESS_EMIT_STEP, int(self.stress_rate * 0.9))
+            self.particles.emit(self.stress_rate, WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2,
+                                (CARD_MATCHED_COLOR, SCORE_COLOR, TITLE_COLOR, LIVES_COLOR),
+                                speed=400.0, lifetime=PARTICLE_LIFETIME)
+        
+        self.particles.update(dt)
+        
+        # Particles are drawn over the sprites; repaint last frame's region
+        if self.particle_rect:
+            self.game_sprites.repaint_rect(self.particle_rect)
+    
+    @profiled
+    def draw_particles(self, screen):
+        """
+        Draw the particles onto the finished frame.
+        
+        Args:
+            screen: The pygame screen to draw on
+        """
+        self.particle_rect = self.particles.draw(screen)
+        if self.particle_rect and self.dirty_rendering:
+            self.dirty_rects.append(self.particle_rect)
+    
+    @profiled
+    def draw_particle_stats(self, game):
+        """
+        Show the live particle count and frame rate while the stress test runs.
+        
+        Args:
+            game: The game state object
+        """
+        if self.particle_stress and not game.debug_mode:
+            self.toggle_particle_stress()
+        
+        if self.particle_stress:
+            stats = f"Particles: {self.particles.live:,} | FPS: {self.frame_clock.get_fps():.0f}"
+            self.show_text(self.stress_sprite, self.debug_font, stats, (255, 100, 100),
+                           bottomleft=(20, WINDOW_HEIGHT - 50))
+        else:
+            self.stress_sprite.hide()
+    
+    def show_text(self, sprite, font, text, color, **position):
+        """
+        Show a single line of text on a sprite.
+        
+        Args:
+            sprite (ContentSprite): The sprite to show the text on
+            font: The font to render the text with
+            text (str): The text to show
+            color: The text color
+            **position: Keyword arguments for get_rect() placing the text
+        """
+        def render():
+            image = self.text_cache.render(font, text, True, color)
+            return image, image.get_rect(**position)
+        
+        sprite.show((font, text, color, tuple(position.items())), render)
+    
+    def show_number(self, sprite, font, label, number, color, **position):
+        """
+        Show a label followed by a number on a sprite.
+        
+        Args:
+            sprite (ContentSprite): The sprite to show the text on
+            font: The font to render the text with
+            label (str): Text before the number, e.g. "Score: "
+            number (str): The formatted number
+            color: The text color
+            **position: Keyword arguments for get_rect() placing the text
+        """
+        def render():
+            image = self.render_number(font, label, number, color)
+            return image, image.get_rect(**position)
+        
+        sprite.show((font, label, number, color, tuple(position.items())), render)
+    
+    def render_number(self, font, label, number, color):
+        """
+        Render a label followed by a number.
+        
+        Both come from the font's glyph atlas, so a number changing every
+        frame costs a few blits rather than rasterizing text.
+        
+        Args:
+            font: The font to render the text with
+            label (str): Text before the number
+            number (str): The formatted number
+            color: The text color
+            
+        Returns:
+            pygame.Surface: The rendered text
+        """
+        atlas = self.glyphs.get(font, color)
+        if not atlas.supports(number):
+            return self.text_cache.render(font, label + number, True, color)
+        return atlas.render(number, label)
+    
+    @profiled
+    def draw_profiler(self, game):
+        """
+        Show the frame profiler in debug mode.
+        
+        The overlay is only redrawn every PROFILER_REFRESH frames so drawing
+        it barely shows up in the timings it reports.
+        
+        Args:
+            game: The game state object
+        """
+        if game.debug_mode and profiler.frames:
+            self.profiler_sprite.show(profiler.frames // PROFILER_REFRESH, self.render_profiler)
+        else:
+            self.profiler_sprite.hide(release=True)
+    
+    def render_profiler(self):
+        """
+        Render the per-phase timing table and the frame time graph.
         
-        # Draw to the screen
-        screen.blit(self.surface, (0, 0))
+        The numbers change on every refresh, so the text is rendered
+        directly rather than through the text cache.
+        
+        Returns:
+            tuple: (pygame.Surface, pygame.Rect) of the profiler overlay
+        """
+        rows = profiler.stats()
+        line_height = self.profiler_font.get_linesize()
+        padding = 6
+        graph_height = 50
+        width = 300
+        height = (len(rows) + 1) * line_height + graph_height + padding * 3
+        image = pygame.Surface((width, height), pygame.SRCALPHA)
+        image.fill((0, 0, 0, 190))
+        
+        # Timing table: the whole frame first, then each phase
+        columns = (width - 150, width - 100, width - 50)
+        header = [("ms", padding)] + list(zip(("p50", "p95", "p99"), columns))
+        for text, x in header:
+            image.blit(self.profiler_font.render(text, True, SCORE_COLOR), (x, padding))
+        for i, (name, p50, p95, p99) in enumerate(rows, 1):
+            y = padding + i * line_height
+            image.blit(self.profiler_font.render(name, True, TEXT_COLOR), (padding, y))
+            for value, x in zip((p50, p95, p99), columns):
+                image.blit(self.profiler_font.render(f"{value:6.2f}", True, TEXT_COLOR), (x, y))
+        
+        # Frame time graph scaled to two frames at the target rate, with a
+        # line marking the frame budget
+        graph = pygame.Rect(padding, height - graph_height - padding, width - padding * 2, graph_height)
+        budget = 1000 / FPS
+        scale = graph.height / (budget * 2)
+        frame_times = list(profiler.frame_times)[-graph.width:]
+        for x, frame_time in enumerate(frame_times):
+            bar = min(graph.height, int(frame_time * scale))
+            color = LIVES_COLOR if frame_time > budget else CARD_MATCHED_COLOR
+            pygame.draw.line(image, color, (graph.x + x, graph.bottom - 1), (graph.x + x, graph.bottom - bar))
+        budget_y = graph.bottom - int(budget * scale)
+        pygame.draw.line(image, SCORE_COLOR, (graph.x, budget_y), (graph.right, budget_y))
+        
+        return prepare_surface(image, alpha=True), image.get_rect(topleft=(10, 140))
     
-    def draw_title(self, game=None):
+    def draw_button(self, button):
         """
-        Draw the game title and debug indicator if applicable.
+        Show a button.
         
         Args:
-            game: Optional game state object to check debug mode
+            button (Button): The button to show
         """
-        title = self.title_font.render("MIND FLIP", True, TITLE_COLOR)
-        title_rect = title.get_rect(centerx=WINDOW_WIDTH//2, y=20)
-        self.surface.blit(title, title_rect)
+        self.button_sprites[button].show(
+            (button.text, button.hovered),
+            lambda: (button.render(), button.rect.copy())
+        )
+    
+    def draw_icons(self):
+        """Show the info icons and any hovered tooltip."""
+        for icon in (self.rules_icon, self.points_icon):
+            self.icon_sprites[icon].show(icon.hovered, lambda: (icon.render(), icon.get_rect()))
+        
+        self.draw_tooltips()
+    
+    def draw_tooltips(self):
+        """Show the tooltip of any hovered info icon above everything but toasts."""
+        for icon in (self.rules_icon, self.points_icon):
+            if icon.hovered:
+                self.tooltip_sprites[icon].show(icon.font, icon.get_tooltip)
+            else:
+                self.tooltip_sprites[icon].hide()
+    
+    @profiled
+    def draw_chrome(self):
+        """Show the title, controls line, buttons and info icons."""
+        self.draw_title()
+        self.draw_controls()
+        
+        for button in [self.back_button] + self.text_size_buttons:
+            self.draw_button(button)
         
-        # Add debug mode indicator if enabled
-        if game and game.debug_mode:
-            debug_text = self.debug_font.render("DEBUG MODE", True, (255, 100, 100))
-            self.surface.blit(debug_text, (10, 10))
+        self.draw_icons()
+    
+    def draw_title(self):
+        """Show the game title."""
+        self.show_text(self.title_sprite, self.title_font, "MIND FLIP", TITLE_COLOR,
+                       centerx=WINDOW_WIDTH//2, y=20)
     
+    @profiled
+    def draw_debug_label(self, game):
+        """
+        Show the debug mode indicator if debug mode is enabled.
+        
+        Args:
+            game: The game state object
+        """
+        if game.debug_mode:
+            self.show_text(self.debug_label_sprite, self.debug_font, "DEBUG MODE", (255, 100, 100),
+                           topleft=(10, 10))
+        else:
+            self.debug_label_sprite.hide()
+    
+    @profiled
     def draw_hud(self, game):
         """
-        Draw the heads-up display with game stats.
+        Show the heads-up display with game stats.
         
         Args:
             game: The game state object
         """
-        # Draw level
-        level_text = self.hud_font.render(f"Level: {game.level}", True, TEXT_COLOR)
-        self.surface.blit(level_text, (WINDOW_WIDTH//2 - level_text.get_width()//2, 70))
+        # Level
+        self.show_number(self.level_sprite, self.hud_font, "Level: ", str(game.level), TEXT_COLOR,
+                         centerx=WINDOW_WIDTH//2, y=70)
+        
+        # Score, rolling up to the new value after points are scored
+        score = self.score_counter.update(game.score, clock.now())
+        self.show_number(self.score_sprite, self.hud_font, "Score: ", str(score), SCORE_COLOR,
+                         topright=(WINDOW_WIDTH - 20, 70))
+        
+        # Tries/lives
+        self.lives_sprite.show(
+            (self.hud_font, game.tries),
+            lambda: self.render_lives(game.tries)
+        )
+    
+    def render_lives(self, tries):
+        """
+        Render the lives label followed by one heart per remaining try.
         
-        # Draw score
-        score_text = self.hud_font.render(f"Score: {game.score}", True, SCORE_COLOR)
-        self.surface.blit(score_text, (WINDOW_WIDTH - score_text.get_width() - 20, 70))
+        Args:
+            tries (int): Number of lives left
         
-        # Draw tries/lives
-        lives_text = self.hud_font.render("Lives: ", True, TEXT_COLOR)
-        self.surface.blit(lives_text, (20, 70))
+        Returns:
+            tuple: (pygame.Surface, pygame.Rect) of the lives display
+        """
+        lives_text = self.text_cache.render(self.hud_font, "Lives: ", True, TEXT_COLOR)
         
-        # Draw heart symbols for lives
+        # The image starts at the label's left edge and the hearts' top edge
+        origin_x, origin_y = 20, 65
         heart_width = 25
-        for i in range(game.tries):
-            heart_x = 20 + lives_text.get_width() + (i * heart_width)
-            pygame.draw.polygon(self.surface, LIVES_COLOR, [
-                (heart_x, 80),
-                (heart_x - 10, 70),
-                (heart_x - 5, 65),
-                (heart_x, 70),
-                (heart_x + 5, 65),
-                (heart_x + 10, 70)
+        width = lives_text.get_width() + max(0, tries - 1) * heart_width + 11
+        height = max(70 + lives_text.get_height(), 81) - origin_y
+        image = pygame.Surface((width, height), pygame.SRCALPHA)
+        image.blit(lives_text, (20 - origin_x, 70 - origin_y))
+        
+        # Draw heart symbols for lives
+        for i in range(tries):
+            heart_x = 20 + lives_text.get_width() + (i * heart_width) - origin_x
+            pygame.draw.polygon(image, LIVES_COLOR, [
+                (heart_x, 80 - origin_y),
+                (heart_x - 10, 70 - origin_y),
+                (heart_x - 5, 65 - origin_y),
+                (heart_x, 70 - origin_y),
+                (heart_x + 5, 65 - origin_y),
+                (heart_x + 10, 70 - origin_y)
             ])
+        
+        return prepare_surface(image, alpha=True), image.get_rect(topleft=(origin_x, origin_y))
     
+    @profiled
     def draw_cards(self, game):
         """
-        Draw the card grid.
+        Show the card grid and the cursor.
+        
+        Only the cells inside the layout's viewport are drawn, each on a
+        sprite from a pool sized to what fits on screen, so the cost does not
+        depend on the size of the grid. Cards whose state changed turn over,
+        or pulse when matched, using frames the card animator built for the
+        layout.
         
         Args:
             game: The game state object
         """
-        rows, cols = game.grid_size
+        layout = game.layout
+        if game.cards is not self.scene_cards:
+            self.scene_cards = game.cards
+            self.card_animator.reset()
+        if (layout, game.debug_mode) != self.scene_layout:
+            # A marathon board has too many faces to build up front; its
+            # animation frames are built as cards turn over
+            values = () if game.marathon else {card.value for card in game.cards}
+            self.card_animator.prepare(layout.card_width, layout.card_height, values, game.debug_mode)
+            self.scene_layout = (layout, game.debug_mode)
+        
+        current_time = clock.now()
+        rows, cols = layout.visible_cells()
+        views = self.card_view_pool(len(rows) * len(cols))
+        shown = 0
+        for row in rows:
+            for col in cols:
+                card = game.get_card_at(row, col)
+                if card is None:
+                    continue
+                view = views[shown]
+                shown += 1
+                
+                state = card_state(card)
+                card_rect = layout.card_rect(row, col)
+                self.card_animator.update((row, col), state, current_time)
+                frame = self.card_animator.frame((row, col), card.value, game.debug_mode, current_time)
+                if frame is not None:
+                    view.show((frame, card_rect),
+                              lambda: layout.clip(frame, frame.get_rect(center=card_rect.center)))
+                    continue
+                
+                view.show(
+                    (state, card.value, game.debug_mode, layout, card_rect),
+                    lambda: layout.clip(
+                        self.card_sprites.get(layout.card_width, layout.card_height, state,
+                                              card.value, game.debug_mode),
+                        card_rect
+                    )
+                )
+        
+        # Hide the sprites left over
+        for view in views[shown:]:
+            view.hide()
+        
+        # Highlight the card under the cursor
+        row, col = game.cursor_pos
+        if game.get_card_at(row, col) is None:
+            self.cursor_sprite.hide()
+        else:
+            highlight_rect = layout.highlight_rect(row, col)
+            self.cursor_sprite.show((layout, highlight_rect),
+                                    lambda: self.render_cursor(layout, highlight_rect))
+    
+    def card_view_pool(self, count):
+        """
+        Get the card sprites, adding more if fewer than count exist.
         
-        # Calculate available space for the grid
-        available_width = WINDOW_WIDTH - 40  # 20px margin on each side
-        available_height = WINDOW_HEIGHT - 200  # Space for HUD and controls
+        Args:
+            count (int): Number of cards that can be on screen at once
+            
+        Returns:
+            list: The card sprites
+        """
+        if count > len(self.card_views):
+            added = [ContentSprite(LAYER_CARDS) for _ in range(count - len(self.card_views))]
+            self.card_views.extend(added)
+            self.game_sprites.add(added)
+        return self.card_views
+    
+    def render_cursor(self, layout, highlight_rect):
+        """
+        Render the highlight border drawn around the card under the cursor.
         
-        # Calculate card dimensions to fit within available space
-        card_width = min(CARD_WIDTH, (available_width - (cols-1) * CARD_MARGIN) / cols)
-        card_height = min(CARD_HEIGHT, (available_height - (rows-1) * CARD_MARGIN) / rows)
+        Args:
+            layout (CardLayout): The current card layout
+            highlight_rect (pygame.Rect): The highlight's outer rect
         
-        # Maintain aspect ratio
-        aspect_ratio = CARD_WIDTH / CARD_HEIGHT
-        if card_width / card_height > aspect_ratio:
-            card_width = card_height * aspect_ratio
-        else:
-            card_height = card_width / aspect_ratio
-            
-        # Calculate grid dimensions with the adjusted card size
-        grid_width = cols * (card_width + CARD_MARGIN) - CARD_MARGIN
-        grid_height = rows * (card_height + CARD_MARGIN) - CARD_MARGIN
-        
-        # Center the grid on screen
-        start_x = (WINDOW_WIDTH - grid_width) // 2
-        start_y = 120  # Position below HUD
-        
-        # Draw each card
-        for card in game.cards:
-            x = start_x + card.col * (card_width + CARD_MARGIN)
-            y = start_y + card.row * (card_height + CARD_MARGIN)
-            
-            # Draw card background with different colors based on state
-            if card.matched:
-                # Matched cards get a green tint
-                pygame.draw.rect(self.surface, CARD_MATCHED_COLOR, (x, y, card_width, card_height))
-            elif card.flipped:
-                # Flipped but not matched cards
-                pygame.draw.rect(self.surface, CARD_FRONT_COLOR, (x, y, card_width, card_height))
-            else:
-                # Face-down cards
-                if game.debug_mode:
-                    # Semi-transparent in debug mode
-                    card_surface = pygame.Surface((card_width, card_height), pygame.SRCALPHA)
-                    card_surface.fill((CARD_BACK_COLOR[0], CARD_BACK_COLOR[1], CARD_BACK_COLOR[2], 180))
-                    self.surface.blit(card_surface, (x, y))
-                else:
-                    pygame.draw.rect(self.surface, CARD_BACK_COLOR, (x, y, card_width, card_height))
-            
-            # Scale font size based on card size
-            font_scale = min(card_width / CARD_WIDTH, 1.0)
-            card_font = pygame.font.SysFont('Arial', int(32 * font_scale), bold=True)
-            debug_font = pygame.font.SysFont('Arial', int(16 * font_scale), bold=True)
-            
-            # Draw card value
-            if card.flipped or (game.debug_mode and not card.matched):
-                # For flipped cards or in debug mode, show the value
-                value_text = card_font.render(str(card.value), True, (0, 0, 0))
-                text_rect = value_text.get_rect(center=(x + card_width//2, y + card_height//2))
-                self.surface.blit(value_text, text_rect)
-            
-            # In debug mode, also show small number in corner for face-down cards
-            if game.debug_mode and not card.flipped and not card.matched:
-                small_value = debug_font.render(str(card.value), True, (255, 255, 255))
-                self.surface.blit(small_value, (x + 5, y + 5))
-            
-            # If not in debug mode and card is face down, draw card back design
-            if not game.debug_mode and not card.flipped:
-                inner_margin = int(10 * font_scale)
-                pygame.draw.rect(self.surface, (100, 100, 150), 
-                                (x + inner_margin, y + inner_margin, 
-                                 card_width - 2*inner_margin, card_height - 2*inner_margin))
-                
-                # Draw a simple pattern on the back
-                line_spacing = int(30 * font_scale)
-                line_margin = int(20 * font_scale)
-                for i in range(3):
-                    pygame.draw.line(self.surface, (50, 50, 100),
-                                    (x + line_margin, y + line_margin + i*line_spacing),
-                                    (x + card_width - line_margin, y + line_margin + i*line_spacing), 
-                                    max(1, int(3 * font_scale)))
-            
-            # Highlight the card under the cursor
-            if card.row == game.cursor_pos[0] and card.col == game.cursor_pos[1]:
-                highlight_thickness = max(1, int(3 * font_scale))
-                pygame.draw.rect(self.surface, CARD_HIGHLIGHT_COLOR, 
-                                (x - highlight_thickness, y - highlight_thickness, 
-                                 card_width + 2*highlight_thickness, card_height + 2*highlight_thickness), 
-                                highlight_thickness)
+        Returns:
+            tuple: (pygame.Surface, pygame.Rect) of the highlight
+        """
+        image = pygame.Surface(highlight_rect.size, pygame.SRCALPHA)
+        pygame.draw.rect(image, CARD_HIGHLIGHT_COLOR, image.get_rect(), layout.highlight_thickness)
+        return layout.clip(prepare_surface(image, alpha=True), highlight_rect)
     
+    @profiled
     def draw_game_state(self, game):
         """
-        Draw an indicator of the current game state for better user feedback.
+        Show an indicator of the current game state for better user feedback.
         
         Args:
             game: The game state object
@@ -446,62 +1097,83 @@ class UI:
             state_text = "Checking match..."
         
         if state_text:
-            text = self.state_font.render(state_text, True, TEXT_COLOR)
-            text_rect = text.get_rect(centerx=WINDOW_WIDTH//2, y=100)
-            self.surface.blit(text, text_rect)
+            self.show_text(self.game_state_sprite, self.state_font, state_text, TEXT_COLOR,
+                           centerx=WINDOW_WIDTH//2, y=100)
+        else:
+            self.game_state_sprite.hide()
     
+    @profiled
     def draw_combo(self, game):
-        """Draw the combo indicator."""
+        """Show the combo indicator."""
         if game.combo_count > 0:
             multiplier = game.get_combo_multiplier()
-            combo_text = self.hud_font.render(f"Combo: x{game.combo_count} ({multiplier:.1f}x)", True, SCORE_COLOR)
-            self.surface.blit(combo_text, (20, 110))
+            self.show_number(self.combo_sprite, self.hud_font, "Combo: ",
+                             f"x{game.combo_count} ({multiplier:.1f}x)", SCORE_COLOR,
+                             topleft=(20, 110))
+        else:
+            self.combo_sprite.hide()
     
     def draw_controls(self):
-        """Draw the control instructions."""
-        controls_text = self.state_font.render(
-            "Controls: Arrows ←↑↓→ | Flip: Enter | Reset: R | Menu: ESC | Quit: Q", 
-            True, TEXT_COLOR
+        """Show the control instructions."""
+        self.show_text(
+            self.controls_sprite, self.state_font,
+            "Controls: Arrows ←↑↓→ | Flip: Enter/Click | Reset: R | Menu: ESC | Quit: Q",
+            TEXT_COLOR,
+            centerx=WINDOW_WIDTH//2, bottom=WINDOW_HEIGHT - 20
         )
-        controls_rect = controls_text.get_rect(
-            centerx=WINDOW_WIDTH//2, 
-            bottom=WINDOW_HEIGHT - 20
-        )
-        self.surface.blit(controls_text, controls_rect)
     
+    @profiled
     def draw_toast(self):
-        """Draw a toast message if one is active."""
-        if self.toast_message:
-            current_time = time.time()
-            if current_time - self.toast_time < self.toast_duration:
-                # Calculate alpha based on time remaining (fade out effect)
-                time_left = self.toast_duration - (current_time - self.toast_time)
-                alpha = min(255, int(time_left * 255 / (self.toast_duration / 2)))
-                
-                # Create toast background
-                toast_surface = pygame.Surface((400, 40), pygame.SRCALPHA)
-                toast_surface.fill((0, 0, 0, min(180, alpha)))
-                
-                # Create toast text
-                toast_text = self.hud_font.render(self.toast_message, True, (255, 255, 255, alpha))
-                text_rect = toast_text.get_rect(center=(200, 20))
-                toast_surface.blit(toast_text, text_rect)
-                
-                # Draw toast at bottom center
-                self.surface.blit(toast_surface, (WINDOW_WIDTH//2 - 200, WINDOW_HEIGHT - 80))
-            else:
-                self.toast_message = None
+        """Show the active toast messages, newest at the bottom."""
+        current_time = clock.now()
+        while self.toasts and self.toasts[0].expired(current_time):
+            self.toasts.popleft()
+        
+        y = WINDOW_HEIGHT - 80
+        sprites = iter(self.toast_sprites)
+        for toast, sprite in zip(reversed(self.toasts), sprites):
+            # Fade by modulating the alpha of the pre-rendered surface
+            alpha = toast.alpha(current_time)
+            
+            # Show toast centred horizontally, stacking older ones upwards
+            sprite.show((toast, alpha, y), lambda: self.render_toast(toast, alpha, y))
+            y -= sprite.rect.height + 5
+        
+        # Hide the sprites left over
+        for sprite in sprites:
+            sprite.hide(release=True)
+    
+    def render_toast(self, toast, alpha, y):
+        """
+        Fade a toast and place it.
+        
+        Args:
+            toast (Toast): The toast to show
+            alpha (int): Its opacity
+            y (int): Top edge of the toast
+        
+        Returns:
+            tuple: (pygame.Surface, pygame.Rect) of the toast
+        """
+        toast.surface.set_alpha(alpha)
+        return toast.surface, toast.surface.get_rect(centerx=WINDOW_WIDTH//2, y=y)
     
     def show_toast(self, message):
         """
         Show a toast message at the bottom of the screen.
         
+        Up to TOAST_QUEUE_SIZE toasts are shown stacked at once; beyond that
+        the oldest one is dropped. Repeating the newest message while it is
+        still showing does nothing.
+        
         Args:
             message: The message to display
         """
-        self.toast_message = message
-        self.toast_time = time.time()
+        if self.toasts and self.toasts[-1].message == message and not self.toasts[-1].expired(clock.now()):
+            return
+        self.toasts.append(Toast(message, self.hud_font, self.toast_duration))
     
+    @profiled
     def draw_level_transition(self, game):
         """
         Draw the level transition screen.
@@ -509,126 +1181,171 @@ class UI:
         Args:
             game: The game state object
         """
+        key = ('level_complete', game.level, game.points_earned_this_level)
+        self.draw_overlay(key, self.render_level_transition, game)
+    
+    @profiled
+    def draw_game_over(self, game):
+        """
+        Draw the game over screen.
+        
+        Args:
+            game: The game state object
+        """
+        key = ('game_over', game.score, game.level, game.high_score, game.debug_mode)
+        self.draw_overlay(key, self.render_game_over, game)
+    
+    def draw_overlay(self, key, render, game):
+        """
+        Show a full-window overlay, composing it only when its content changes.
+        
+        The overlay is built once when the game enters the level complete or
+        game over state and kept until the state is left.
+        
+        Args:
+            key: Hashable description of the overlay content
+            render: Callable building the overlay surface from the game
+            game: The game state object
+        """
+        def render_overlay():
+            overlay = render(game)
+            return overlay, overlay.get_rect()
+        
+        self.overlay_sprite.show(key, render_overlay)
+    
+    def render_level_transition(self, game):
+        """
+        Compose the level transition overlay.
+        
+        Args:
+            game: The game state object
+        
+        Returns:
+            pygame.Surface: The finished overlay
+        """
         # Semi-transparent overlay
         overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 200))  # Black with alpha
-        self.surface.blit(overlay, (0, 0))
         
         # Level complete text
-        level_text = self.message_font.render(f"LEVEL {game.level} COMPLETED!", True, (100, 255, 100))
+        level_text = self.text_cache.render(self.message_font, f"LEVEL {game.level} COMPLETED!", True, (100, 255, 100))
         level_rect = level_text.get_rect(centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 - 70)
-        self.surface.blit(level_text, level_rect)
+        overlay.blit(level_text, level_rect)
         
         # Points earned
-        points_text = self.hud_font.render(f"Points Earned: {game.points_earned_this_level}", True, SCORE_COLOR)
+        points_text = self.render_number(self.hud_font, "Points Earned: ", str(game.points_earned_this_level), SCORE_COLOR)
         points_rect = points_text.get_rect(centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2)
-        self.surface.blit(points_text, points_rect)
+        overlay.blit(points_text, points_rect)
         
         # Level bonus
-        bonus_text = self.hud_font.render(f"Level Bonus: {LEVEL_BONUS * game.level}", True, SCORE_COLOR)
+        bonus_text = self.render_number(self.hud_font, "Level Bonus: ", str(LEVEL_BONUS * game.level), SCORE_COLOR)
         bonus_rect = bonus_text.get_rect(centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 + 30)
-        self.surface.blit(bonus_text, bonus_rect)
+        overlay.blit(bonus_text, bonus_rect)
         
         # Next level text
-        next_text = self.hud_font.render(f"Level {game.level + 1} Unlocked!", True, TEXT_COLOR)
+        next_text = self.text_cache.render(self.hud_font, f"Level {game.level + 1} Unlocked!", True, TEXT_COLOR)
         next_rect = next_text.get_rect(centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 + 70)
-        self.surface.blit(next_text, next_rect)
+        overlay.blit(next_text, next_rect)
         
         # Extra life notification if applicable
         if game.level % 2 == 0:  # Every 2 levels
-            life_text = self.hud_font.render("Extra Life Awarded! ♥", True, LIVES_COLOR)
+            life_text = self.text_cache.render(self.hud_font, "Extra Life Awarded! ♥", True, LIVES_COLOR)
             life_rect = life_text.get_rect(centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 + 110)
-            self.surface.blit(life_text, life_rect)
+            overlay.blit(life_text, life_rect)
+        
+        return prepare_surface(overlay, alpha=True)
     
-    def draw_game_over(self, game):
+    def render_game_over(self, game):
         """
-        Draw the game over screen.
+        Compose the game over overlay.
         
         Args:
             game: The game state object
+        
+        Returns:
+            pygame.Surface: The finished overlay
         """
         # Semi-transparent overlay
         overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 180))  # Black with alpha
-        self.surface.blit(overlay, (0, 0))
         
         # Game over text
-        game_over_text = self.message_font.render("GAME OVER", True, (255, 50, 50))
+        game_over_text = self.text_cache.render(self.message_font, "GAME OVER", True, (255, 50, 50))
         game_over_rect = game_over_text.get_rect(centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 - 70)
-        self.surface.blit(game_over_text, game_over_rect)
+        overlay.blit(game_over_text, game_over_rect)
         
         # Score text
-        score_text = self.hud_font.render(f"Final Score: {game.score}", True, TEXT_COLOR)
+        score_text = self.text_cache.render(self.hud_font, f"Final Score: {game.score}", True, TEXT_COLOR)
         score_rect = score_text.get_rect(centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 - 10)
-        self.surface.blit(score_text, score_rect)
+        overlay.blit(score_text, score_rect)
         
         # Level reached
-        level_text = self.hud_font.render(f"Level Reached: {game.level}", True, TEXT_COLOR)
+        level_text = self.text_cache.render(self.hud_font, f"Level Reached: {game.level}", True, TEXT_COLOR)
         level_rect = level_text.get_rect(centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 + 20)
-        self.surface.blit(level_text, level_rect)
+        overlay.blit(level_text, level_rect)
         
         # High score text (only if not in debug mode)
         if not game.debug_mode:
-            high_score_text = self.hud_font.render(f"High Score: {game.high_score}", True, SCORE_COLOR)
+            high_score_text = self.text_cache.render(self.hud_font, f"High Score: {game.high_score}", True, SCORE_COLOR)
             high_score_rect = high_score_text.get_rect(centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 + 50)
-            self.surface.blit(high_score_text, high_score_rect)
+            overlay.blit(high_score_text, high_score_rect)
         else:
-            debug_note = self.hud_font.render("(Debug Mode: High Score Not Saved)", True, (255, 100, 100))
+            debug_note = self.text_cache.render(self.hud_font, "(Debug Mode: High Score Not Saved)", True, (255, 100, 100))
             debug_rect = debug_note.get_rect(centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 + 50)
-            self.surface.blit(debug_note, debug_rect)
+            overlay.blit(debug_note, debug_rect)
         
         # Restart instructions
-        restart_text = self.hud_font.render("Press R to restart or Q to quit", True, TEXT_COLOR)
+        restart_text = self.text_cache.render(self.hud_font, "Press R to restart or Q to quit", True, TEXT_COLOR)
         restart_rect = restart_text.get_rect(centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 + 100)
-        self.surface.blit(restart_text, restart_rect)
+        overlay.blit(restart_text, restart_rect)
+        
+        return prepare_surface(overlay, alpha=True)
     
-    def draw_splash_screen(self, screen, debug_mode=False):
+    def draw_splash_screen(self, screen, debug_mode=False, marathon=False):
         """
         Draw the initial splash screen.
         
         Args:
             screen: The pygame screen to draw on
             debug_mode: Current debug mode state
+            marathon: Current marathon mode state
         """
         # Draw animated background
         self.draw_animated_background()
         
         # Title
-        title = self.title_font.render("MIND FLIP: MEMORY ARCADE", True, TITLE_COLOR)
-        title_rect = title.get_rect(centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 - 120)
-        self.surface.blit(title, title_rect)
+        self.show_text(self.splash_title_sprite, self.title_font, "MIND FLIP: MEMORY ARCADE", TITLE_COLOR,
+                       centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 - 120)
         
         # Game description
-        desc_text = self.hud_font.render("Match pairs of cards before running out of lives!", True, TEXT_COLOR)
-        desc_rect = desc_text.get_rect(centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 - 60)
-        self.surface.blit(desc_text, desc_rect)
+        self.show_text(self.splash_description_sprite, self.hud_font,
+                       "Match pairs of cards before running out of lives!", TEXT_COLOR,
+                       centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 - 60)
         
         # Start instruction
-        start_text = self.hud_font.render("Press ENTER to Start", True, TEXT_COLOR)
-        start_rect = start_text.get_rect(centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 + 20)
-        self.surface.blit(start_text, start_rect)
+        start_text = "Press ENTER to Start Marathon" if marathon else "Press ENTER to Start"
+        self.show_text(self.splash_start_sprite, self.hud_font, start_text, TEXT_COLOR,
+                       centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 + 20)
         
         # Controls info
-        controls_text = self.state_font.render("Use arrow keys to navigate, Enter to flip cards", True, TEXT_COLOR)
-        controls_rect = controls_text.get_rect(centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 + 60)
-        self.surface.blit(controls_text, controls_rect)
+        self.show_text(self.splash_controls_sprite, self.state_font,
+                       "Use arrow keys and Enter, or click, to flip cards | M: Marathon mode", TEXT_COLOR,
+                       centerx=WINDOW_WIDTH//2, centery=WINDOW_HEIGHT//2 + 60)
         
         # Update debug button text based on current state
         self.debug_button.text = "Debug: " + ("ON" if debug_mode else "OFF")
         
         # Draw debug mode button
-        self.debug_button.draw(self.surface)
+        self.draw_button(self.debug_button)
         
-        # Draw info icons
-        self.rules_icon.draw(self.surface)
-        self.points_icon.draw(self.surface)
+        # Draw info icons and their tooltips if hovered
+        self.draw_icons()
         
-        # Draw tooltips if hovered
-        self.rules_icon.draw_tooltip(self.surface)
-        self.points_icon.draw_tooltip(self.surface)
+        # Draw toast messages if active
+        self.draw_toast()
         
-        # Draw to the screen
-        screen.blit(self.surface, (0, 0))
+        # Finish the frame
+        self.present(screen, self.splash_sprites)
     
     def handle_splash_events(self, event, game):
         """
@@ -637,7 +1354,7 @@ class UI:
         Args:
             event: The pygame event
             game: The game state object
-            
+        
         Returns:
             bool: True if debug mode was toggled
         """
@@ -665,24 +1382,24 @@ class UI:
     def handle_text_size_buttons(self, event, game):
         """Handle clicks on text size buttons."""
         if event.type == pygame.MOUSEBUTTONDOWN:
-            pos = pygame.mouse.get_pos()
+            pos = event.pos
             
             # Check small text button
             if self.text_size_buttons[0].check_hover(pos):
-                game.set_text_size(0.8)  # Small
-                self.update_fonts(0.8)
+                game.set_text_size(TEXT_SIZE_SMALL)
+                self.update_fonts(TEXT_SIZE_SMALL)
                 return True
-                
+            
             # Check medium text button
             elif self.text_size_buttons[1].check_hover(pos):
-                game.set_text_size(1.0)  # Medium (default)
-                self.update_fonts(1.0)
+                game.set_text_size(TEXT_SIZE_MEDIUM)  # Default
+                self.update_fonts(TEXT_SIZE_MEDIUM)
                 return True
-                
+            
             # Check large text button
             elif self.text_size_buttons[2].check_hover(pos):
-                game.set_text_size(1.2)  # Large
-                self.update_fonts(1.2)
+                game.set_text_size(TEXT_SIZE_LARGE)
+                self.update_fonts(TEXT_SIZE_LARGE)
                 return True
-                
+        
         return False
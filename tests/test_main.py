@@ -0,0 +1,55 @@
+"""
+Tests for the event handling in mindflip.src.main
+"""
+
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+import pytest
+from mindflip.src.config import WINDOW_WIDTH, WINDOW_HEIGHT, SCROLL_STEP
+from mindflip.src.game import Game
+from mindflip.src.headless import clear_shared_caches
+from mindflip.src.main import handle_event
+from mindflip.src.ui import UI
+
+@pytest.fixture
+def marathon():
+    """A marathon game on a board larger than the screen, scrolled to the middle."""
+    pygame.init()
+    pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    game = Game(high_score_file=None, marathon=True)
+    game.level = 20
+    game.setup_level()
+    layout = game.layout
+    assert layout.max_scroll_x > 2 * SCROLL_STEP and layout.max_scroll_y > 2 * SCROLL_STEP
+    layout.scroll_to(layout.max_scroll_x // 2, layout.max_scroll_y // 2)
+    yield game, UI(seed=0)
+    pygame.key.set_mods(0)
+    clear_shared_caches()
+    pygame.quit()
+
+def wheel(game, ui, x, y):
+    """Send a mouse wheel event and get how far the board scrolled."""
+    layout = game.layout
+    before = (layout.scroll_x, layout.scroll_y)
+    handle_event(pygame.event.Event(pygame.MOUSEWHEEL, x=x, y=y, flipped=False), game, ui, True)
+    return layout.scroll_x - before[0], layout.scroll_y - before[1]
+
+def test_wheel_up_scrolls_up(marathon):
+    assert wheel(*marathon, 0, 1) == (0, -SCROLL_STEP)
+
+def test_wheel_down_scrolls_down(marathon):
+    assert wheel(*marathon, 0, -1) == (0, SCROLL_STEP)
+
+def test_wheel_right_scrolls_right(marathon):
+    assert wheel(*marathon, 1, 0) == (SCROLL_STEP, 0)
+
+def test_wheel_left_scrolls_left(marathon):
+    assert wheel(*marathon, -1, 0) == (-SCROLL_STEP, 0)
+
+def test_shift_wheel_down_scrolls_right(marathon):
+    pygame.key.set_mods(pygame.KMOD_SHIFT)
+    assert wheel(*marathon, 0, -1) == (SCROLL_STEP, 0)